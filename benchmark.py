@@ -0,0 +1,427 @@
+import argparse
+import hashlib
+import importlib
+import json
+import math
+import mimetypes
+import multiprocessing
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout, redirect_stderr
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from orchestrator import load_manifest, DEFAULT_MANIFEST, SITE_HOSTS
+
+# 네트워크 없이 도는 크롤러 벤치마크.
+# 사이트마다 녹화하거나 합성해 둔 목록/상세/이미지 응답(fixtures/bench/<사이트>/, 네 사이트 모두 커밋되어 있다)을 로컬 HTTP 서버로 내보내고,
+# 크롤러를 새 프로세스에서 그 서버를 대상으로 돌려 상품/초, 상품당 처리 시간 p50/p95, 최대 RSS, 쓴 바이트를 잰다.
+# 크롤러의 HTTP 요청(http_client 의 Session: 목록/상세 HTML, 이미지)은 ReplayAdapter 가 https://<호스트>/<경로> 를
+# http://127.0.0.1:<포트>/<호스트>/<경로> 로 바꿔 보내므로 URL 필터 등 크롤러 코드는 그대로 돈다.
+# daall 의 목록은 브라우저로 열기 때문에 DAALL_BASE 를 서버 주소로 준다 (Chrome 과 받아 둔 chromedriver 필요, 경로는 CHROMEDRIVER 환경 변수로).
+# 출력/이미지 저장소/trace 는 임시 작업 디렉토리에 쓰고, 결과는 benchmarks/results.jsonl 에 쌓아 이전 결과와 비교한다.
+#
+#   python benchmark.py --record wiselux --pages 2    (네트워크가 되는 곳에서 fixture 녹화, 작업은 crawl_jobs.json 의 것)
+#   python benchmark.py [wiselux daall ddd luxhour] [--repeat 3] [--label 설명]
+#   python benchmark.py --history wiselux
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BASE_DIR, "fixtures", "bench")
+FIXTURE_FILENAME = "fixture.json"
+RESULTS_PATH = os.path.join(BASE_DIR, "benchmarks", "results.jsonl")
+LOG_FILENAME = "crawl.log"
+RECORD_PAGES = 2  # 녹화할 목록 페이지 수 (재생할 때도 이만큼만 크롤링)
+
+# 경로에 호스트가 없는 요청(브라우저가 연 페이지 안의 상대 링크)은 orchestrator.SITE_HOSTS 의 사이트 호스트에서 찾는다.
+# 브라우저로 여는 목록 페이지. 녹화할 때 Session 으로도 한 번 받아 두어 재생 때 Chrome 이 서버에서 연다
+# (daall 의 '더보기' 는 사이트 스크립트가 행을 붙이므로 녹화한 fixture 는 첫 화면까지만 돈다.
+#  커밋된 fixtures/bench/daall 은 합성 목록 페이지에 '더보기' 스크립트를 넣어 두어 붙는 행까지 돈다)
+BROWSER_PAGES = {
+    'daall': lambda crawler: [f"{crawler.SITE_URL}/category/{crawler.CATEGORY_PATH}/"],
+}
+
+
+def fixture_key(netloc, path, query):
+    return f"{netloc}{path or '/'}" + (f"?{query}" if query else "")
+
+
+class Fixture:
+    # fixtures/bench/<사이트>/fixture.json : 크롤링 작업(params, pages)과 URL 키 -> 응답 본문 파일
+    # (파일 경로는 사이트 디렉토리 기준. 녹화하면 bodies/ 아래에 쓰고, 손으로 만든 fixture 는 다른 fixture 파일도 가리킬 수 있다)
+    def __init__(self, site, fixture_dir=FIXTURE_DIR):
+        self.site = site
+        self.path = os.path.join(fixture_dir, site)
+        self.data = {'site': site, 'params': {}, 'pages': RECORD_PAGES, 'recorded_at': None, 'responses': {}}
+        self._lock = threading.Lock()
+
+    @property
+    def exists(self):
+        return os.path.exists(os.path.join(self.path, FIXTURE_FILENAME))
+
+    @property
+    def responses(self):
+        return self.data['responses']
+
+    def load(self):
+        with open(os.path.join(self.path, FIXTURE_FILENAME), encoding='utf-8') as f:
+            self.data = json.load(f)
+        return self
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = os.path.join(self.path, FIXTURE_FILENAME + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, os.path.join(self.path, FIXTURE_FILENAME))
+
+    def add(self, key, content_type, body):
+        # 녹화: 여러 스레드에서 불린다
+        extension = mimetypes.guess_extension((content_type or "").split(';')[0].strip()) or ".bin"
+        filename = hashlib.sha1(key.encode('utf-8')).hexdigest() + extension
+        os.makedirs(os.path.join(self.path, "bodies"), exist_ok=True)
+        with open(os.path.join(self.path, "bodies", filename), 'wb') as f:
+            f.write(body)
+        with self._lock:
+            self.responses[key] = {'file': f"bodies/{filename}", 'content_type': content_type}
+
+    def read_bodies(self):
+        # 키 -> (content_type, 본문). 서버가 디스크를 읽느라 느려지지 않도록 미리 메모리에 올린다
+        bodies = {}
+        for key, entry in self.responses.items():
+            with open(os.path.join(self.path, entry['file']), 'rb') as f:
+                bodies[key] = (entry['content_type'], f.read())
+        return bodies
+
+
+class ReplayAdapter(HTTPAdapter):
+    # 재생(origin): 요청을 fixture 서버로 돌린다. 녹화(fixture): 실제 응답을 받아 fixture 에 저장한다
+    def __init__(self, origin=None, fixture=None, **kwargs):
+        super().__init__(**kwargs)
+        self.origin = origin
+        self.fixture = fixture
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        if self.origin is not None:
+            if f"{parts.scheme}://{parts.netloc}" != self.origin:
+                request.url = f"{self.origin}/{fixture_key(parts.netloc, parts.path, parts.query)}"
+            return super().send(request, **kwargs)
+        response = super().send(request, **kwargs)
+        if self.fixture is not None and response.status_code == 200:
+            # stream=True 요청도 여기서 본문을 읽어 두면 iter_content 가 읽어 둔 본문을 돌려준다
+            self.fixture.add(fixture_key(parts.netloc, parts.path, parts.query), response.headers.get('Content-Type'), response.content)
+        return response
+
+
+class FixtureServer:
+    # with FixtureServer(fixture) as server: ... server.origin
+    def __init__(self, fixture):
+        self.bodies = fixture.read_bodies()
+        self.hosts = {key.split('/', 1)[0] for key in self.bodies}
+        self.default_host = SITE_HOSTS[fixture.site]
+        self.requests = 0
+        self.misses = []
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.origin = f"http://127.0.0.1:{self.httpd.server_port}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # 실제 사이트처럼 keep-alive
+
+            def do_GET(self):
+                server.serve(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve(self, handler):
+        parts = urlsplit(handler.path)
+        host, _, rest = parts.path.lstrip('/').partition('/')
+        if host not in self.hosts:
+            host, rest = self.default_host, parts.path.lstrip('/')
+        key = fixture_key(host, '/' + rest, parts.query)
+        found = self.bodies.get(key)
+        with self._lock:
+            self.requests += 1
+            if found is None:
+                self.misses.append(key)
+        content_type, body = found if found is not None else ("text/plain", b"")
+        handler.send_response(200 if found is not None else 404)
+        handler.send_header("Content-Type", content_type or "application/octet-stream")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        return False
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        # Windows: psutil 이 있으면 최대 작업 집합
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1024 / 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024  # macOS 는 바이트, Linux 는 KB
+
+
+def _crawl(site, params, pages, work_dir, origin=None, record_dir=None):
+    # 새 프로세스에서 실행: 출력/이미지 저장소/trace 를 work_dir 로 돌리고 크롤러 main() 을 돈다
+    # origin 이 있으면 fixture 서버에서 재생, record_dir 이 있으면 실제 사이트를 크롤링하며 녹화
+    if site == 'daall' and origin:
+        os.environ['DAALL_BASE'] = origin  # daall 은 import 할 때 읽는다
+    fixture = Fixture(site, record_dir) if record_dir else None
+    with open(os.path.join(work_dir, LOG_FILENAME), 'w', encoding='utf-8') as log_file, \
+            redirect_stdout(log_file), redirect_stderr(log_file):
+        import engine
+        import http_client
+        import image_store
+        import tracing
+        tracing.TRACE_DIR = os.path.join(work_dir, "traces")
+        tracing.METRICS_DIR = os.path.join(work_dir, "metrics")
+        # 이전 실행의 이미지 저장소를 재사용하지 않도록 빈 저장소에서 시작한다
+        image_store._store = image_store.ImageStore(os.path.join(work_dir, "image_store"))
+        adapter = ReplayAdapter(origin=origin, fixture=fixture,
+                                pool_connections=http_client.POOL_CONNECTIONS, pool_maxsize=http_client.POOL_MAXSIZE)
+        session = http_client.get_session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        engine.SiteAdapter.max_pages = pages
+
+        crawler = importlib.import_module(site)
+        crawler.BASE_DIR = work_dir
+        crawler.configure(**params)
+        if fixture is not None:
+            for url in BROWSER_PAGES.get(site, lambda crawler: [])(crawler):
+                http_client.fetch_html(url)
+        start_time = time.perf_counter()
+        rows = crawler.main()
+        seconds = time.perf_counter() - start_time
+
+    if fixture is not None:
+        fixture.data.update(params=params, pages=pages, recorded_at=time.strftime('%Y-%m-%d %H:%M:%S'))
+        fixture.save()
+    product_ms = []
+    with open(tracing.get_tracer().trace_path, encoding='utf-8') as f:
+        for line in f:
+            span = json.loads(line)
+            if span['stage'] == "product" and span['status'] == "ok":
+                product_ms.append(span['ms'])
+    return {'rows': rows or 0, 'seconds': seconds, 'product_ms': product_ms, 'peak_rss_mb': _peak_rss_mb()}
+
+
+def _run_in_process(*args, **kwargs):
+    # 크롤러 모듈의 전역 상태와 메모리 사용량이 섞이지 않도록 실행마다 새 프로세스
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(_crawl, *args, **kwargs).result()
+
+
+def bytes_written(work_dir):
+    # 작업 디렉토리에 생긴 파일 크기의 합 (하드링크는 한 번만, trace/지표/로그 제외)
+    seen = set()
+    total = 0
+    for root, dirs, files in os.walk(work_dir):
+        if root == work_dir:
+            dirs[:] = [name for name in dirs if name not in ("traces", "metrics")]
+            files = [name for name in files if name != LOG_FILENAME]
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            if (stat.st_dev, stat.st_ino) in seen:
+                continue
+            seen.add((stat.st_dev, stat.st_ino))
+            total += stat.st_size
+    return total
+
+
+def percentile(values, q):
+    # 최근접 순위 분위수
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BASE_DIR, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("+dirty" if dirty else "")
+
+
+def record(site, pages=RECORD_PAGES, manifest_path=DEFAULT_MANIFEST, fixture_dir=FIXTURE_DIR):
+    # 네트워크가 되는 곳에서 crawl_jobs.json 의 site 작업을 pages 페이지만큼 크롤링하며 응답을 녹화한다
+    jobs = [job for job in load_manifest(manifest_path)['jobs'] if job['site'] == site]
+    if not jobs:
+        raise ValueError(f"{manifest_path} 에 {site} 작업이 없습니다")
+    params = {key: value for key, value in jobs[0].items() if key != 'site'}
+    fixture_path = os.path.join(fixture_dir, site)
+    if os.path.exists(fixture_path):
+        shutil.rmtree(fixture_path)
+    work_dir = tempfile.mkdtemp(prefix=f"bench_record_{site}_")
+    try:
+        result = _run_in_process(site, params, pages, work_dir, record_dir=fixture_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    fixture = Fixture(site, fixture_dir).load()
+    print(f"{site}: {result['rows']}개 상품, 응답 {len(fixture.responses)}개 녹화 -> {fixture.path}")
+
+
+def run_site(site, repeat=1, keep=False, fixture_dir=FIXTURE_DIR):
+    # fixture 를 repeat 번 재생하고 실행별 결과 목록을 돌려준다
+    fixture = Fixture(site, fixture_dir).load()
+    runs = []
+    for _ in range(repeat):
+        work_dir = tempfile.mkdtemp(prefix=f"bench_{site}_")
+        try:
+            with FixtureServer(fixture) as server:
+                result = _run_in_process(site, fixture.data['params'], fixture.data['pages'], work_dir, origin=server.origin)
+            result['bytes_written'] = bytes_written(work_dir)
+            result['requests'] = server.requests
+            result['misses'] = len(server.misses)
+            if server.misses:
+                print(f"  > {site}: fixture 에 없는 요청 {len(server.misses)}개 (예: {server.misses[0]})")
+        finally:
+            if keep:
+                print(f"  > 작업 디렉토리: {work_dir}")
+            else:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        runs.append(result)
+    return runs
+
+
+def summarize(site, runs, label=None):
+    # 여러 번 돈 결과를 하나로: 상품/초와 바이트는 중앙값, 상품당 시간은 모든 실행을 합쳐 분위수, RSS 는 최대
+    product_ms = [ms for run in runs for ms in run['product_ms']]
+    rss = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+    return {
+        'run_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'commit': git_commit(),
+        'label': label,
+        'site': site,
+        'repeat': len(runs),
+        'rows': runs[-1]['rows'],
+        'seconds': round(statistics.median(run['seconds'] for run in runs), 3),
+        'products_per_sec': round(statistics.median(run['rows'] / run['seconds'] for run in runs), 3),
+        'p50_ms': percentile(product_ms, 0.5),
+        'p95_ms': percentile(product_ms, 0.95),
+        'peak_rss_mb': round(max(rss), 1) if rss else None,
+        'bytes_written': int(statistics.median(run['bytes_written'] for run in runs)),
+        'requests': runs[-1]['requests'],
+        'misses': runs[-1]['misses'],
+    }
+
+
+def load_results(path=RESULTS_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_result(result, path=RESULTS_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+# (키, 표시 이름, 클수록 좋은지)
+REPORT_COLUMNS = [
+    ('products_per_sec', "상품/초", True),
+    ('p50_ms', "p50(ms)", False),
+    ('p95_ms', "p95(ms)", False),
+    ('peak_rss_mb', "RSS(MB)", False),
+    ('bytes_written', "쓴 바이트", False),
+]
+
+
+def format_result(result, previous=None):
+    parts = [f"{result['site']:<8} {result['rows']:>5}개 {result['seconds']:>8.2f}초"]
+    for key, title, higher_is_better in REPORT_COLUMNS:
+        value = result.get(key)
+        text = f"{title} {value if value is not None else '-'}"
+        before = previous.get(key) if previous else None
+        if value is not None and before:
+            change = (value - before) / before * 100
+            better = change > 0 if higher_is_better else change < 0
+            text += f" ({change:+.1f}%{'' if abs(change) < 1 else ' 개선' if better else ' 악화'})"
+        parts.append(text)
+    return "  ".join(parts)
+
+
+def print_history(site, path=RESULTS_PATH):
+    previous = None
+    for result in load_results(path):
+        if result['site'] != site:
+            continue
+        print(f"{result['run_at']} {result.get('commit') or '-':<14} {result.get('label') or '':<12} {format_result(result, previous)}")
+        previous = result
+
+
+def main(sites, repeat=1, label=None, keep=False):
+    history = load_results()
+    for site in sites:
+        if not Fixture(site).exists:
+            print(f"{site}: fixture 없음 ({os.path.join(FIXTURE_DIR, site)}). 네트워크가 되는 곳에서 --record {site} 로 녹화하세요.")
+            continue
+        try:
+            runs = run_site(site, repeat=repeat, keep=keep)
+        except Exception as e:
+            print(f"{site}: 벤치마크 실패 - {type(e).__name__}: {e}")
+            continue
+        result = summarize(site, runs, label)
+        previous = next((item for item in reversed(history) if item['site'] == site), None)
+        save_result(result)
+        print(format_result(result, previous))
+        if previous:
+            print(f"  (비교: {previous['run_at']} {previous.get('commit') or ''} {previous.get('label') or ''})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="녹화한 fixture 로 크롤러를 오프라인에서 돌려 성능을 잰다")
+    parser.add_argument("sites", nargs="*", default=list(SITE_HOSTS), help="기본: 네 사이트 모두")
+    parser.add_argument("--repeat", type=int, default=1, help="사이트마다 반복 횟수 (중앙값으로 기록)")
+    parser.add_argument("--label", help="results.jsonl 에 남길 설명")
+    parser.add_argument("--keep", action="store_true", help="작업 디렉토리(출력, 로그, trace)를 지우지 않는다")
+    parser.add_argument("--record", action="store_true", help="실제 사이트를 크롤링하며 fixture 녹화 (네트워크 필요)")
+    parser.add_argument("--pages", type=int, default=RECORD_PAGES, help="녹화할 목록 페이지 수")
+    parser.add_argument("--history", action="store_true", help="저장된 결과를 사이트별로 출력")
+    args = parser.parse_args()
+    unknown = [site for site in args.sites if site not in SITE_HOSTS]
+    if unknown:
+        parser.error(f"알 수 없는 사이트: {', '.join(unknown)}")
+    if args.history:
+        for site in args.sites:
+            print_history(site)
+    elif args.record:
+        for site in args.sites:
+            record(site, pages=args.pages)
+    else:
+        main(args.sites, repeat=args.repeat, label=args.label, keep=args.keep)
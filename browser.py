@@ -0,0 +1,237 @@
+import json
+import os
+import sys
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from http_client import USER_AGENT
+
+# 크롤러가 공유하는 Chrome 설정.
+# HTML 만 파싱하고 이미지는 따로 받으므로, 사이트별 프로필로 headless + 'eager' 로드에 이미지/폰트/CSS/분석 스크립트를 막는다.
+# 이미지는 Chrome prefs 로, 나머지는 CDP Network.setBlockedURLs 로 차단하며, 사이트에 꼭 필요한 리소스는 프로필의 allow 로 남긴다.
+# 고정 sleep 대신 쓰는 준비 상태 대기(wait_for_*)와 페이지 안에서 값을 뽑는 스크립트의 공용 함수(JS_HELPERS),
+# 목록 행을 한 번에 읽는 extract_rows 도 여기에 둔다.
+# report=True 로 띄운 드라이버는 performance 로그로 페이지마다 받은 바이트 / 막힌 요청 수 / 로딩 시간을 알려준다.
+# chromedriver 는 CHROMEDRIVER 환경 변수에 경로가 있으면 그것을 쓰고(네트워크 불필요), 없으면 webdriver_manager 로 받는다.
+
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER")  # 받아 둔 chromedriver 경로 (benchmark 등 오프라인 실행)
+
+BLOCK_PATTERNS = {
+    'image': ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico"],
+    'font': ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    'css': ["*.css"],
+    'media': ["*.mp4", "*.webm", "*.m3u8"],
+    'analytics': [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*",
+        "*connect.facebook.net*", "*analytics.naver.com*", "*wcs.naver.net*", "*criteo.*", "*kakao.com/pixel*",
+    ],
+}
+
+# allow: 사이트가 실제로 필요로 해서 막지 않는 리소스 종류
+PROFILES = {
+    # Cafe24 목록/상세: 목록은 URL 로 넘기고 클릭하지 않으므로 CSS 도 막는다
+    'wiselux': {'headless': True, 'page_load_strategy': 'eager', 'allow': set()},
+    # Cafe24 '더보기' 는 스크립트로 클릭하므로 CSS 도 막는다
+    'daall': {'headless': True, 'page_load_strategy': 'eager', 'allow': set()},
+    # 스마트스토어 상세: '상세정보 펼쳐보기' 버튼이 클릭 가능해야 하므로 CSS 는 남긴다
+    'smartstore': {'headless': True, 'page_load_strategy': 'eager', 'allow': {'css'}},
+    # 비교/디버깅용: 기존과 같은 전체 로딩
+    'full': {'headless': False, 'page_load_strategy': 'normal', 'allow': set(BLOCK_PATTERNS)},
+}
+
+
+# execute_script 로 페이지 안에서 상세 정보를 뽑는 스크립트 앞에 붙이는 함수들. BeautifulSoup 파싱과 같은 문자열을 만든다
+#   textOf(el)              : el.text.strip()
+#   strippedText(el, sep)   : el.get_text(sep, strip=True) (script/style 안의 텍스트 제외)
+#   attrOf(el, ...names)    : el.get(name1) or el.get(name2) ...
+JS_HELPERS = """
+const textOf = (el) => el ? el.textContent.trim() : null;
+const strippedText = (el, sep = '') => {
+    if (!el) return null;
+    const parts = [];
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        const parent = node.parentNode.nodeName;
+        if (parent === 'SCRIPT' || parent === 'STYLE') continue;
+        const text = node.data.trim();
+        if (text) parts.push(text);
+    }
+    return parts.join(sep);
+};
+const attrOf = (el, ...names) => {
+    for (const name of names) {
+        const value = el.getAttribute(name);
+        if (value) return value;
+    }
+    return null;
+};
+"""
+
+
+def blocked_url_patterns(profile):
+    return [pattern for kind, patterns in BLOCK_PATTERNS.items() if kind not in profile['allow'] for pattern in patterns]
+
+
+def driver_service():
+    if CHROMEDRIVER_PATH:
+        return Service(CHROMEDRIVER_PATH)
+    from webdriver_manager.chrome import ChromeDriverManager
+    return Service(ChromeDriverManager().install())
+
+
+def setup_driver(profile_name, report=False):
+    profile = PROFILES[profile_name]
+    chrome_options = ChromeOptions()
+    if profile['headless']:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    chrome_options.add_argument("--incognito")
+    if 'image' not in profile['allow']:
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if report:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    chrome_options.page_load_strategy = profile['page_load_strategy']
+
+    driver = webdriver.Chrome(service=driver_service(), options=chrome_options)
+    driver.set_window_size(1200, 800)
+
+    patterns = blocked_url_patterns(profile)
+    if patterns:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    print(f"--- WebDriver 설정 완료 (프로필: {profile_name}, 차단 패턴 {len(patterns)}개) ---")
+    return driver
+
+
+def wait_for_element(driver, css_selector, timeout=5):
+    # 요소가 DOM 에 나타날 때까지 대기. 시간 안에 나타나면 True
+    try:
+        WebDriverWait(driver, timeout).until(lambda d: d.find_elements(By.CSS_SELECTOR, css_selector))
+        return True
+    except TimeoutException:
+        return False
+
+
+def count_elements(driver, css_selector):
+    # 요소 개수만 센다 (find_elements 처럼 모든 요소 참조를 받아오지 않는다)
+    return driver.execute_script("return document.querySelectorAll(arguments[0]).length;", css_selector)
+
+
+def wait_for_count_increase(driver, css_selector, previous_count, timeout=10):
+    # 목록에 항목이 추가될 때까지 대기('더보기' 클릭 후 등). 늘어난 뒤 개수, 시간 초과면 None
+    def increased(d):
+        count = count_elements(d, css_selector)
+        return count if count > previous_count else False
+
+    try:
+        return WebDriverWait(driver, timeout).until(increased)
+    except TimeoutException:
+        return None
+
+
+def wait_for_dom_settled(driver, css_selector="body", quiet_ms=300, timeout=10):
+    # MutationObserver 로 css_selector 아래 DOM 이 quiet_ms 동안 바뀌지 않을 때까지 대기 (비동기로 채워지는 상세 영역 등)
+    # 조용해지면 True, timeout 까지 계속 바뀌면 False
+    driver.set_script_timeout(timeout + 1)
+    return driver.execute_async_script("""
+        const [selector, quietMs, timeoutMs, done] = arguments;
+        const target = document.querySelector(selector) || document.body;
+        let timer = null;
+        const finish = (settled) => { observer.disconnect(); clearTimeout(timer); clearTimeout(deadline); done(settled); };
+        const observer = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(() => finish(true), quietMs); });
+        observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+        timer = setTimeout(() => finish(true), quietMs);
+        const deadline = setTimeout(() => finish(false), timeoutMs);
+    """, css_selector, quiet_ms, timeout * 1000)
+
+
+def extract_rows(driver, row_selector, fields, start=0, empty_read_rows=False):
+    # row_selector 에 맞는 목록 행마다 fields 의 값을 execute_script 한 번으로 읽어 dict 목록으로 돌려준다
+    # (행/요소마다 find_element, get_attribute, .text 로 WebDriver 를 왕복하지 않는다)
+    # fields: {키: (행 안의 css 선택자 또는 None(행 자신), 'text' 또는 속성 이름)}. 요소가 없으면 값은 None
+    # 'text' 는 WebElement.text 처럼 보이는 텍스트를, src/href 같은 속성은 get_attribute 처럼 절대 URL 을 준다
+    # start: 앞의 행 start 개는 건너뛴다 ('더보기' 로 덧붙은 행만 읽을 때)
+    # empty_read_rows: 읽은 행의 내용을 비워 계속 늘어나는 목록의 DOM 을 작게 유지한다 (행 자체와 속성은 남아 개수는 그대로)
+    return driver.execute_script("""
+        const [rowSelector, fields, start, emptyReadRows] = arguments;
+        const read = (el, what) => {
+            if (!el) return null;
+            if (what === 'text') return el.innerText.trim();
+            return typeof el[what] === 'string' ? el[what] : el.getAttribute(what);
+        };
+        return Array.from(document.querySelectorAll(rowSelector)).slice(start).map((row) => {
+            const values = {};
+            for (const [key, [selector, what]] of Object.entries(fields)) {
+                values[key] = read(selector ? row.querySelector(selector) : row, what);
+            }
+            if (emptyReadRows) row.replaceChildren();
+            return values;
+        });
+    """, row_selector, {key: list(spec) for key, spec in fields.items()}, start, empty_read_rows)
+
+
+def page_report(driver):
+    # 마지막 호출 이후 받은 바이트 / 요청 수 / 막힌 요청 수와 현재 페이지의 로딩 시간(ms)
+    # report=True 로 띄운 드라이버에서만 의미가 있다. performance 로그는 읽을 때 비워진다.
+    received_bytes = 0
+    requests_finished = 0
+    blocked = 0
+    try:
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry['message'])['message']
+            if message['method'] == "Network.loadingFinished":
+                received_bytes += message['params'].get('encodedDataLength', 0)
+                requests_finished += 1
+            elif message['method'] == "Network.loadingFailed" and message['params'].get('blockedReason'):
+                blocked += 1
+    except Exception:
+        pass
+    timing = driver.execute_script(
+        "const nav = performance.getEntriesByType('navigation')[0];"
+        "return nav ? [nav.domContentLoadedEventEnd, nav.loadEventEnd] : [0, 0];"
+    )
+    return {
+        'bytes': received_bytes,
+        'requests': requests_finished,
+        'blocked': blocked,
+        'dom_content_loaded_ms': round(timing[0]),
+        'load_ms': round(timing[1]),
+    }
+
+
+def format_report(report):
+    return (f"받은 데이터 {report['bytes'] / 1024:.0f}KB (요청 {report['requests']}개, 차단 {report['blocked']}개), "
+            f"DOMContentLoaded {report['dom_content_loaded_ms']}ms")
+
+
+def compare_profiles(url, profile_name):
+    # 같은 URL 을 'full' 과 지정한 프로필로 한 번씩 열어, 페이지당 아낀 바이트와 시간을 출력
+    results = {}
+    for name in ('full', profile_name):
+        driver = setup_driver(name, report=True)
+        try:
+            start_time = time.time()
+            driver.get(url)
+            elapsed = time.time() - start_time
+            report = page_report(driver)
+            results[name] = (report, elapsed)
+            print(f"[{name}] {format_report(report)}, driver.get {elapsed:.2f}초")
+        finally:
+            driver.quit()
+    (full_report, full_elapsed), (lean_report, lean_elapsed) = results['full'], results[profile_name]
+    print(f"절약: {(full_report['bytes'] - lean_report['bytes']) / 1024:.0f}KB, "
+          f"driver.get {full_elapsed - lean_elapsed:.2f}초, "
+          f"DOMContentLoaded {full_report['dom_content_loaded_ms'] - lean_report['dom_content_loaded_ms']}ms")
+
+
+if __name__ == "__main__":
+    # python browser.py <프로필> <URL>
+    compare_profiles(sys.argv[2], sys.argv[1])
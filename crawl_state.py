@@ -0,0 +1,126 @@
+import json
+import os
+import time
+
+# 중단된 크롤링을 이어서 하기 위한 상태 파일 (CAT_OUTPUT_DIR/crawl_state.json).
+# 끝난 상품 ID, 진행 중이던 페이지와 그 페이지의 시작 순위, 아직 끝나지 않은 이미지 작업을 기록한다.
+# --resume 없이 시작하면 상태를 새로 만들고, --resume 이면 저장된 상태에서 이어간다.
+# 결과 writer 가 행을 파일에 내보낼 때마다 그 행들의 상품 ID 만 crawl_state.done 에 한 줄씩 덧붙이고
+# (writer 가 fsync 할 때만 함께 fsync), 전체 상태(crawl_state.json)는 페이지 경계와 끝에서만 다시 써서 로그를 비운다.
+# 파일에 있는 행과 저장된 완료 ID 가 늘 같아서 중간에 죽은 뒤 --resume 해도 이미 쓴 상품을 다시 쓰거나,
+# 쓰지 못한 상품을 완료로 치지 않는다. 상품 하나를 저장하는 비용은 완료 상품 수와 상관없이 일정하다.
+
+STATE_FILENAME = "crawl_state.json"
+DONE_LOG_FILENAME = "crawl_state.done"  # 마지막 전체 저장 이후 완료한 상품 ID (한 줄에 하나)
+
+
+class CrawlState:
+    def __init__(self, output_dir, resume=False, download_service=None, result_writer=None):
+        self.path = os.path.join(output_dir, STATE_FILENAME)
+        self.log_path = os.path.join(output_dir, DONE_LOG_FILENAME)
+        self.download_service = download_service  # 있으면 저장할 때 미완료 이미지 작업을 함께 기록
+        self.result_writer = None
+        self.done_ids = set()
+        self.page = 1
+        self.next_rank = 1
+        self.pending_images = []
+        self.resumed = False
+        self._unlogged = []  # 완료로 표시했지만 아직 로그에 쓰지 않은 ID (writer 버퍼에 있는 행)
+        self._log = None
+        if result_writer is not None:
+            self.attach_writer(result_writer)
+
+        if resume and os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+            self.done_ids = set(saved.get('done_ids', []))
+            self.page = saved.get('page', 1)
+            self.next_rank = saved.get('next_rank', 1)
+            self.pending_images = [tuple(job) for job in saved.get('pending_images', [])]
+            self.done_ids.update(self._read_log())
+            self.resumed = True
+            print(f"크롤링 상태 복원: 완료 상품 {len(self.done_ids)}개, {self.page} 페이지 / 순위 {self.next_rank} 부터, "
+                  f"미완료 이미지 {len(self.pending_images)}개")
+        else:
+            if resume:
+                print(f"저장된 크롤링 상태가 없어 처음부터 시작합니다: {self.path}")
+            self._remove_log()  # 이전 실행의 로그가 새 크롤링의 완료 ID 로 섞이지 않도록
+
+    def attach_writer(self, result_writer):
+        # writer 가 행을 파일에 내보낼 때마다(on_flush) 그 행들의 ID 를 로그에 덧붙인다
+        self.result_writer = result_writer
+        result_writer.on_flush = self._log_flushed
+
+    def is_done(self, product_id):
+        return str(product_id) in self.done_ids
+
+    def start_page(self, page, first_rank):
+        # 페이지를 시작할 때 호출: 재시작하면 이 페이지, 이 순위부터 다시 센다
+        self.page = page
+        self.next_rank = first_rank
+        self.save()
+
+    def mark_done(self, product_id, next_rank=None):
+        # 결과 행을 writer 에 넘기기 직전에 부른다. 파일에 저장되는 것은 그 행이 flush 될 때다
+        self.done_ids.add(str(product_id))
+        self._unlogged.append(str(product_id))
+        if next_rank is not None:
+            self.next_rank = next_rank
+
+    def _log_flushed(self, synced):
+        # writer 가 버퍼의 행을 모두 파일에 내보낸 직후: 그 행들(= 아직 로그에 없는 완료 ID)을 로그 끝에 덧붙인다
+        if self._unlogged:
+            if self._log is None:
+                self._log = open(self.log_path, 'a', encoding='utf-8')
+            self._log.write("".join(f"{product_id}\n" for product_id in self._unlogged))
+            self._unlogged.clear()
+            self._log.flush()
+        if synced and self._log is not None:
+            os.fsync(self._log.fileno())
+
+    def _read_log(self):
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path, encoding='utf-8') as f:
+            # 쓰다 만 마지막 줄(줄바꿈 없음)은 그 행이 파일에 있는지 알 수 없으므로 완료로 치지 않는다
+            return [line[:-1] for line in f if line.endswith("\n")]
+
+    def _remove_log(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def save(self):
+        # 페이지 경계와 끝에서 호출: writer 의 남은 행을 디스크까지 내리고(그 ID 는 로그로 간다)
+        # 전체 상태를 다시 쓴 뒤 로그를 비운다. 상태 파일을 먼저 바꾸므로 그 사이에 죽어도 로그의 ID 는 중복일 뿐이다
+        if self.result_writer is not None:
+            self.result_writer.flush(sync=True)
+        self._write()
+        self._remove_log()
+
+    def _write(self):
+        if self.download_service is not None:
+            self.pending_images = self.download_service.unfinished_jobs()
+        data = {
+            'page': self.page,
+            'next_rank': self.next_rank,
+            'done_ids': sorted(self.done_ids),
+            'pending_images': [list(job) for job in self.pending_images],
+            'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def resubmit_pending_images(self):
+        # 이전 실행에서 끝나지 않은 이미지 작업을 다시 넘긴다
+        pending_images, self.pending_images = self.pending_images, []
+        for image_url, filename, folder_path, tag in pending_images:
+            self.download_service.submit(image_url, filename, folder_path, tag=tag)
+        if pending_images:
+            print(f"미완료 이미지 {len(pending_images)}개 다시 다운로드 요청")
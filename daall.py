@@ -1,18 +1,13 @@
 import os
-import time
-from selenium import webdriver
+import argparse
+from urllib.parse import urlparse
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import requests
-import pandas as pd
-from bs4 import BeautifulSoup
-import base64
-import re
-from webdriver_manager.chrome import ChromeDriverManager
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from browser import page_report, format_report, wait_for_element, wait_for_count_increase, extract_rows, JS_HELPERS
+from engine import CrawlEngine, SiteAdapter
+from rate_limiter import get_rate_limiter
+from tracing import get_tracer
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CATEGORY_DIR = os.path.join(BASE_DIR, "watch")
@@ -20,277 +15,212 @@ CAT_OUTPUT_DIR = os.path.join(CATEGORY_DIR, "watch_output")
 THUMBNAIL_DIR = os.path.join(CATEGORY_DIR, "썸네일")
 DETAIL_IMAGES_DIR = os.path.join(CATEGORY_DIR, "상세사진")
 
-if not os.path.exists(CAT_OUTPUT_DIR):
-    os.makedirs(CAT_OUTPUT_DIR)
-if not os.path.exists(THUMBNAIL_DIR):
-    os.makedirs(THUMBNAIL_DIR)
-if not os.path.exists(DETAIL_IMAGES_DIR):
-    os.makedirs(DETAIL_IMAGES_DIR)
-    
-print("--- 디렉토리 설정 완료 ---")
+FETCH_MODE = "http"  # "http": 상세 페이지를 HTTP로 가져오고 실패 시에만 브라우저 사용, "browser": 항상 브라우저 사용
+BROWSER_PROFILE = "daall"  # browser.PROFILES 의 Chrome 프로필 (headless, eager 로드, 리소스 차단)
 
-def setup_driver():
-    chrome_options = ChromeOptions()
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    user_agent_string = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    chrome_options.add_argument(f"user-agent={user_agent_string}")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
-    chrome_options.add_argument("--incognito")
-    chrome_options.page_load_strategy = 'normal'
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.set_window_size(1200, 800)
-    print("--- WebDriver 설정 완료 ---")
-    return driver
+SITE_NAME = "daall"
+SITE_URL = os.environ.get("DAALL_BASE", "https://thedaall-dn.com")  # benchmark.py 는 로컬 fixture 서버 주소로 바꾼다
+CATEGORY_NAME = "watch"  # 카테고리 변경시 변경 (Parquet 파티션 이름)
+CATEGORY_PATH = "watch/23"  # 카테고리 변경시 변경 (목록 URL 의 /category/<이름>/<번호>)
+OUTPUT_FORMAT = "csv"  # "csv": CAT_OUTPUT_DIR/raw_data.csv, "parquet": dataset/site=/category=/crawl_date= 파티션
+RAW_DATA_FIELDS = ['순위', '페이지', '상품명', '썸네일 이미지 파일명', '상품가격', '상품 상세']
+REQUEST_RATE = 6  # 사이트 호스트의 초당 최대 요청 수 (상세 HTML + 이미지, 429/503/지연 시 자동으로 줄어든다)
+DETAIL_WORKERS = 4  # 상세 페이지를 동시에 처리할 워커 수 (요청률은 REQUEST_RATE 로 제한)
+# 목록 행과 행마다 읽는 값: (행 안의 css 선택자, 'text' 또는 속성). 선택자 None 은 행(li) 자신
+LISTING_ROW_SELECTOR = "ul.prdList.grid4 > li"  # 상품 li 만 (안쪽 스펙 목록 li 는 세지 않는다)
+LISTING_FIELDS = {
+    'id': (None, 'id'),
+    'thumbnail_url': ('div.thumbnail a img', 'src'),
+    'name': ('strong.name', 'text'),
+    'product_url': ('div.thumbnail a', 'href'),
+}
 
-def save_image(image_url, filename, folder_path):
-    if not image_url.startswith("data:image") and image_url.startswith("//"):
-        image_url = "https:" + image_url
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+DETAIL_READY_SELECTOR = "strong#span_product_price_text"  # 브라우저로 연 상세 페이지에서 이 요소가 보이면 파싱
+# 상세 페이지에서 파싱하는 부분: 가격, 상세 영역(div#prdDetail), 이미지
+DETAIL_TARGETS = [('strong', 'id', 'span_product_price_text'), ('div', 'id', 'prdDetail'), ('img', None, None)]
+
+def configure(category, category_path):
+    # 오케스트레이터(crawl_jobs.json)가 다른 카테고리를 돌릴 때 호출. 위의 기본 카테고리 설정을 덮어쓴다
+    global CATEGORY_DIR, CAT_OUTPUT_DIR, THUMBNAIL_DIR, DETAIL_IMAGES_DIR, CATEGORY_NAME, CATEGORY_PATH
+    CATEGORY_DIR = os.path.join(BASE_DIR, category)
+    CAT_OUTPUT_DIR = os.path.join(CATEGORY_DIR, f"{category}_output")
+    THUMBNAIL_DIR = os.path.join(CATEGORY_DIR, "썸네일")
+    DETAIL_IMAGES_DIR = os.path.join(CATEGORY_DIR, "상세사진")
+    CATEGORY_NAME = category
+    CATEGORY_PATH = category_path
+
+
+def is_valid_detail_page(soup):
+    # 서버 렌더링 HTML에 가격과 상세 영역이 모두 있는지 확인 (없으면 브라우저로 재시도)
+    return (soup.find('strong', id='span_product_price_text') is not None and
+            soup.find('div', id='prdDetail') is not None)
+
+
+def extract_detail_fields(soup):
+    # 가격, div#prdDetail 텍스트, 이미지 주소(ec-data-src 를 먼저, 없으면 src). DETAIL_SCRIPT 와 같은 모양
+    # 💡 상품 가격 정보 추출 (새로운 ID 사용)
+    price_element = soup.find('strong', id='span_product_price_text')
+    prd_detail_div = soup.find('div', id='prdDetail')
+    return {
+        'price': price_element.text.strip() if price_element else None,
+        'description': prd_detail_div.get_text(separator="\n", strip=True) if prd_detail_div else None,
+        'images': [img_tag.get('ec-data-src') or img_tag.get('src') for img_tag in soup.find_all('img')],
     }
-    
-    try:
-        file_path = os.path.join(folder_path, filename)
-        if image_url.startswith("data:image"):
-            match = re.match(r"data:image/(png|jpeg|jpg);base64,(.*)", image_url)
-            if match:
-                base64_data = match.group(2)
-                image_bytes = base64.b64decode(base64_data)
-                with open(file_path, 'wb') as out_file:
-                    out_file.write(image_bytes)
-                print(f"  > BASE64 이미지 저장: {filename}")
-            else:
-                print(f"  > BASE64 형식 불일치: {image_url[:50]}...")
-                pass
-        else:
-            response = requests.get(image_url, stream=True, headers=headers)
-            response.raise_for_status()
-            with open(file_path, 'wb') as out_file:
-                out_file.write(response.content)
-            print(f"  > URL 이미지 저장: {filename}")
 
-        if os.path.exists(file_path):
-            file_size = os.path.getsize(file_path)
-            if file_size == 0:
-                print(f"  > 파일 크기가 0바이트입니다: {filename}")
-                pass
-            else:
-                pass
-        else:
-            print(f"  > 파일 저장 실패: {filename}")
-            pass
 
-    except requests.exceptions.RequestException as e:
-        print(f"  > 이미지 다운로드 실패 (RequestsError): {filename}, URL: {image_url}, 오류: {e}")
-    except Exception as e:
-        print(f"  > 이미지 다운로드 실패 (일반 오류): {filename}, URL: {image_url}, 오류: {e}")
+# 브라우저로 연 상세 페이지 안에서 extract_detail_fields 와 같은 dict 를 만든다 (page_source 전송/파싱 생략)
+DETAIL_SCRIPT = JS_HELPERS + """
+return {
+    price: textOf(document.querySelector('strong#span_product_price_text')),
+    description: strippedText(document.querySelector('div#prdDetail'), '\\n'),
+    images: Array.from(document.querySelectorAll('img'), (img) => attrOf(img, 'ec-data-src', 'src')),
+};
+"""
+
+
+def parse_detail_page(fields, current_product_data_raw, base_url):
+    # 추출한 필드를 결과 행에 넣고 상세 이미지 URL 목록을 돌려준다
+    current_product_data_raw['상품가격'] = fields['price'] if fields['price'] is not None else '가격 정보 없음'
+    current_product_data_raw['상품 상세'] = fields['description']
 
+    detail_image_urls = []
+    for img_to_process in fields['images']:
+        if img_to_process:
+            if img_to_process.startswith("data:image"):
+                continue
+            if img_to_process.startswith("//"):
+                img_to_process = "https:" + img_to_process
+            elif not img_to_process.startswith('http'):
+                img_to_process = base_url.rstrip('/') + img_to_process
 
-def main(): 
-    total_start_time = time.time()
-    driver = setup_driver()
-    all_product_data = []
-    
-    save_interval = 5
-    last_save_count = 0
-    current_page_number = 1
-    thumbnail_counter = (current_page_number - 1)*20 + 1
-    base_url = "https://thedaall-dn.com/category/watch/23/"
-    
-    try:
-        print(f"\n--- 웹사이트 접속: {base_url} ---")
-        driver.get(base_url)
+            if (('/detail/' in img_to_process or '/product/' in img_to_process) and
+                img_to_process.lower().endswith(('.jpg', '.jpeg', '.png'))):
+                detail_image_urls.append(img_to_process)
+
+    return detail_image_urls
+
+
+class DaallAdapter(SiteAdapter):
+    # 목록은 '더보기' 를 눌러 한 화면에 계속 펼치며, 클릭 한 번을 한 페이지로 센다
+    site_name = SITE_NAME
+    fields = RAW_DATA_FIELDS
+    browser_profile = BROWSER_PROFILE
+    fetch_mode = FETCH_MODE
+    detail_targets = DETAIL_TARGETS
+    detail_script = DETAIL_SCRIPT
+    detail_workers = DETAIL_WORKERS
+    restart_listing_on_resume = True  # '더보기' 목록은 처음부터 다시 펼쳐야 하므로 재시작해도 1페이지부터 센다
+    flush_every = 5  # 5행마다 파일에 내보내고 20행마다 fsync
+
+    def __init__(self):
+        super().__init__(CATEGORY_NAME, CAT_OUTPUT_DIR, THUMBNAIL_DIR, DETAIL_IMAGES_DIR, OUTPUT_FORMAT)
+        self.base_url = f"{SITE_URL}/category/{CATEGORY_PATH}/"
+
+    def listing_pages(self, engine, start_page):
+        driver = engine.driver
+        tracer = get_tracer()
+        current_page_number = start_page
+        print(f"\n--- 웹사이트 접속: {self.base_url} ---")
+        with tracer.span("page_load", url=self.base_url, page=current_page_number) as span:
+            driver.get(self.base_url)
+            if not wait_for_element(driver, 'ul.prdList li', timeout=30):
+                span.fail("목록 없음")
+                print("상품 목록을 찾을 수 없습니다. 스크래핑을 종료합니다.")
+                return
         crawled_product_ids = set()
+        listed_count = 0  # 지금까지 읽은 목록 행 수
         
         while True:
-            page_start_time = time.time()
             print(f"\n--- {current_page_number} 페이지 상품 목록 스크래핑 시작 ---")
-            try:
-                WebDriverWait(driver, 30).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'ul.prdList li'))
-                )
-            except Exception:
-                print("상품 목록을 찾을 수 없습니다. 스크래핑을 종료합니다.")
-                break
-            
-            products_on_page = driver.find_elements(By.CSS_SELECTOR, "ul.prdList.grid4 li")
+            # '더보기' 로 새로 덧붙은 행만 스크립트 한 번으로 읽고, 읽은 행은 비워 DOM 이 커지지 않게 한다
+            # (목록이 길어져도 페이지마다 새 행만 다루므로 상품당 목록 비용이 일정하다)
+            rows = extract_rows(driver, LISTING_ROW_SELECTOR, LISTING_FIELDS, start=listed_count, empty_read_rows=True)
+            listed_count += len(rows)
+            report = page_report(driver)
+            tracer.count("bytes_total", report['bytes'], stage="page_load")
+            print(f"목록 페이지 로딩: {format_report(report)}")
             
             newly_found_products = []
-            for product in products_on_page:
-                try:
-                    product_id = product.get_attribute('id')
-                    if product_id and product_id not in crawled_product_ids:
-                        newly_found_products.append(product)
-                        crawled_product_ids.add(product_id)
-                except Exception:
-                    continue
+            for row in rows:
+                if row['id'] and row['id'] not in crawled_product_ids:
+                    newly_found_products.append(row)
+                    crawled_product_ids.add(row['id'])
             
             if not newly_found_products:
                 print(f"{current_page_number} 페이지에서 새로운 상품을 찾을 수 없습니다. 스크래핑을 종료합니다.")
-                break
+                return
 
             product_info_list = []
-            for i, product in enumerate(newly_found_products):
+            for i, row in enumerate(newly_found_products):
                 absolute_index = len(crawled_product_ids) - len(newly_found_products) + i
-                try:
-                    thumbnail_element = product.find_element(By.CSS_SELECTOR, 'div.thumbnail a img')
-                    thumbnail_url = thumbnail_element.get_attribute('src')
-                    
-                    product_name_element = product.find_element(By.CSS_SELECTOR, 'strong.name')
-                    product_name = product_name_element.text.strip()
-                    
-                    product_link_element = product.find_element(By.CSS_SELECTOR, 'div.thumbnail a')
-                    product_url = product_link_element.get_attribute('href')
-                    
-                    product_info_list.append({
-                        'index': absolute_index,
-                        'name': product_name,
-                        'thumbnail_url': thumbnail_url,
-                        'product_url': product_url
-                    })
-                except Exception as e:
-                    print(f"상품 목록 정보 추출 실패: {e}")
+                missing = [key for key, value in row.items() if value is None]
+                if missing:
+                    print(f"상품 목록 정보 추출 실패: {', '.join(missing)} 없음")
                     continue
-            
-            for product_info in product_info_list:
-                i = product_info['index']
-                product_name_on_list = product_info['name']
-                thumbnail_url = product_info['thumbnail_url']
-                product_url = product_info['product_url']
-                
-                product_start_time = time.time()
-                current_product_data_raw = {}
-                
-                try:
-                    print(f"\n--- [{thumbnail_counter}번 상품] 상품명: {product_name_on_list} ---")
-                    current_product_data_raw['순위'] = thumbnail_counter
-                    current_product_data_raw['페이지'] = current_page_number
-                    current_product_data_raw['상품명'] = product_name_on_list
-                    thumbnail_filename = f"{thumbnail_counter}.jpg"
-                    print(f"  > 썸네일 이미지 다운로드 시작...")
-                    save_image(thumbnail_url, thumbnail_filename, folder_path=THUMBNAIL_DIR)
-                    current_product_data_raw['썸네일 이미지 파일명'] = thumbnail_filename
-                    
-                    print(f"  > 상품 상세 페이지 접속: {product_url}")
-                    product_page_start = time.time()
-                    driver.get(product_url)
-                    time.sleep(0.1)
-                    
-                    soup = BeautifulSoup(driver.page_source, 'html.parser')
-                    
-                    # 💡 상품 가격 정보 추출 (새로운 ID 사용)
-                    price_element = soup.find('strong', id='span_product_price_text')
-                    product_price = '가격 정보 없음'
-                    if price_element:
-                        product_price = price_element.text.strip()
-                    
-                    current_product_data_raw['상품가격'] = product_price
-                    print(f"  > 상품 가격 추출 완료: {product_price}")
-
-                    prd_detail_div = soup.find('div', id='prdDetail')
-                    if prd_detail_div:
-                        detail_text = prd_detail_div.get_text(separator="\n", strip=True)
-                        current_product_data_raw['상품 상세'] = detail_text
-                        print("  > 상품 상세 텍스트 추출 완료")
-                    else:
-                        current_product_data_raw['상품 상세'] = None
-                        print("  > 상품 상세 텍스트를 찾을 수 없습니다.")
-                        
-                    all_detail_images_tags = soup.find_all('img')
-                    detail_image_urls = []
-                    for img_tag in all_detail_images_tags:
-                        img_to_process = img_tag.get('ec-data-src') or img_tag.get('src')
-                        if img_to_process:
-                            if img_to_process.startswith("data:image"):
-                                continue
-                            if img_to_process.startswith("//"):
-                                img_to_process = "https:" + img_to_process
-                            elif not img_to_process.startswith('http'):
-                                img_to_process = base_url.rstrip('/') + img_to_process
-                            
-                            if (('/detail/' in img_to_process or '/product/' in img_to_process) and 
-                                img_to_process.lower().endswith(('.jpg', '.jpeg', '.png'))):
-                                detail_image_urls.append(img_to_process)
+                product_info_list.append({'index': absolute_index, **row})
 
-                    detail_image_urls = list(dict.fromkeys(detail_image_urls))
-                    
-                    if detail_image_urls:
-                        print(f"  > 상세 이미지 {len(detail_image_urls)}개 다운로드 시작 (멀티스레딩)")
-                        def download_single_image(url_and_index):
-                            url, index = url_and_index
-                            detail_image_filename = f"{thumbnail_counter}_{index}.jpg"
-                            time.sleep(0.5)
-                            save_image(url, detail_image_filename, folder_path=DETAIL_IMAGES_DIR)
-                            return detail_image_filename
-                        
-                        url_index_pairs = [(url, idx + 1) for idx, url in enumerate(detail_image_urls)]
-                        
-                        with ThreadPoolExecutor(max_workers=5) as executor:
-                            futures = [executor.submit(download_single_image, pair) for pair in url_index_pairs]
-                            downloaded_files = [future.result() for future in as_completed(futures)]
-                        print("  > 상세 이미지 다운로드 완료")
-                    else:
-                        print("  > 상세 이미지를 찾을 수 없습니다.")
-                        
-                    all_product_data.append(current_product_data_raw)
-                    
-                    current_count = len(all_product_data)
-                    should_save = (current_count - last_save_count >= save_interval or i == len(product_info_list) - 1)
-                    
-                    if should_save:
-                        print(f"  > [{current_count}개 상품] raw_data.csv 파일에 중간 저장...")
-                        df = pd.DataFrame(all_product_data)
-                        csv_path = os.path.join(CAT_OUTPUT_DIR, "raw_data.csv")
-                        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-                        last_save_count = current_count
+            yield current_page_number, product_info_list
 
-                    driver.back()
-                    print(f"  > 상품 상세 페이지에서 목록 페이지로 복귀. 소요 시간: {time.time() - product_page_start:.2f}초")
-                except Exception as e:
-                    print(f"  > [{thumbnail_counter}번 상품] 처리 중 오류 발생: {e}")
-                    try:
-                        driver.back()
-                    except:
-                        print("  > 목록 페이지로 돌아가기 실패. 다음 상품으로 넘어갑니다.")
-                        pass
-                    continue
-                
-                thumbnail_counter += 1
-            
-            page_navigation_start = time.time()
             more_button_xpath = '//div[contains(@class, "xans-product-listmore")]/a[contains(@class, "btnMore")]'
-            
             try:
                 next_page_button = WebDriverWait(driver, 10).until(
                     EC.presence_of_element_located((By.XPATH, more_button_xpath))
                 )
                 print(f"\n[{current_page_number} 페이지] '더보기' 버튼 클릭...")
-                driver.execute_script("arguments[0].click();", next_page_button)
-                time.sleep(2)
+                with tracer.span("page_load", page=current_page_number + 1, more=True) as span:
+                    driver.execute_script("arguments[0].click();", next_page_button)
+                    # 고정 대기 대신 목록 li 개수가 늘어날 때까지 기다린다 (늘지 않으면 다음 루프에서 종료)
+                    if wait_for_count_increase(driver, LISTING_ROW_SELECTOR, listed_count) is None:
+                        span.fail("추가된 상품 없음")
+                        print("  > '더보기' 후 추가된 상품이 없습니다.")
             except Exception:
                 print(f"\n[{current_page_number} 페이지] '더보기' 버튼을 찾을 수 없습니다. 스크래핑을 종료합니다.")
-                break
+                return
             
             current_page_number += 1
-            print(f"[{current_page_number-1} 페이지] 처리 완료. 총 소요 시간: {time.time() - page_start_time:.2f}초")
-            
-    finally:
-        if driver:
-            driver.quit()
+
+    def extract_detail(self, soup):
+        return extract_detail_fields(soup)
+
+    def crawl_detail(self, engine, product_info, thumbnail_counter, current_page_number):
+        current_product_data_raw = {}
+        print(f"\n--- [{thumbnail_counter}번 상품] 상품명: {product_info['name']} ---")
+        current_product_data_raw['순위'] = thumbnail_counter
+        current_product_data_raw['페이지'] = current_page_number
+        current_product_data_raw['상품명'] = product_info['name']
+        thumbnail_filename = f"{thumbnail_counter}.jpg"
+        engine.submit_image(product_info['thumbnail_url'], thumbnail_filename, THUMBNAIL_DIR, thumbnail_counter)
+        current_product_data_raw['썸네일 이미지 파일명'] = thumbnail_filename
         
-        if all_product_data and len(all_product_data) > last_save_count:
-            print("\n--- 스크래핑 종료. 최종 데이터 저장 ---")
-            df = pd.DataFrame(all_product_data)
-            csv_path = os.path.join(CAT_OUTPUT_DIR, "raw_data.csv")
-            df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+        print(f"  > 상품 상세 페이지 접속: {product_info['product_url']}")
+        fields = engine.fetch_detail(product_info['product_url'], is_valid_detail_page, DETAIL_READY_SELECTOR)
+        detail_image_urls = parse_detail_page(fields, current_product_data_raw, self.base_url)
+        print(f"  > 상품 가격 추출 완료: {current_product_data_raw['상품가격']}")
+        if current_product_data_raw['상품 상세'] is not None:
+            print("  > 상품 상세 텍스트 추출 완료")
+        else:
+            print("  > 상품 상세 텍스트를 찾을 수 없습니다.")
+
+        detail_image_urls = list(dict.fromkeys(detail_image_urls))
         
-        total_end_time = time.time()
-        total_duration = total_end_time - total_start_time
-        print(f"\n--- 스크래핑 작업 완료! 총 소요 시간: {total_duration:.2f}초 ---")
+        if detail_image_urls:
+            # 상세 이미지는 다운로드 서비스에 넘기고 바로 다음 상품으로 넘어간다
+            for idx, url in enumerate(detail_image_urls, 1):
+                engine.submit_image(url, f"{thumbnail_counter}_{idx}.jpg", DETAIL_IMAGES_DIR, thumbnail_counter)
+            print(f"  > 상세 이미지 {len(detail_image_urls)}개 다운로드 요청 (대기 중 {engine.download_service.pending_count()}개)")
+        else:
+            print("  > 상세 이미지를 찾을 수 없습니다.")
+
+        return current_product_data_raw
+
+
+def main(resume=False):
+    # 고정 동시성(5) 대신 공용 rate_limiter 가 사이트 호스트의 요청률/동시성을 REQUEST_RATE 이하에서 조절한다
+    get_rate_limiter().set_rate(urlparse(SITE_URL).netloc, REQUEST_RATE)
+    return CrawlEngine(DaallAdapter(), resume=resume).run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", action="store_true", help="crawl_state.json 에 기록된 곳부터 이어서 크롤링")
+    args = parser.parse_args()
+    main(resume=args.resume)
\ No newline at end of file
@@ -0,0 +1,113 @@
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, SoupStrainer
+
+# 상세 페이지 HTML 파싱.
+# lxml 이 있으면 lxml 로 파싱하고(없으면 html.parser), 필요한 하위 트리만 Tag 로 만든다.
+# 대상은 (태그 이름, 속성 이름, 속성 값) 목록으로 적는다. 속성 이름이 None 이면 태그 이름만 본다.
+# 예: [('div', 'class', 'cont'), ('strong', 'id', 'span_product_price_text'), ('img', None, None)]
+# 대상과 맞는 요소는 하위 트리 전체를 만들고, 그 밖의 태그와 텍스트는 버린다.
+# scan_subtree 는 하위 트리를 한 번만 돌면서 상세 설명 문단과 이미지 태그를 함께 모은다.
+# extract_rows_from_soup 는 HTTP 로 받은 목록 HTML 에서 browser.extract_rows 와 같은 행 목록을 만든다.
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+
+def _class_matches(classes, wanted):
+    # bs4 의 class_ 와 같은 규칙: wanted 중 하나가 클래스 중 하나이거나, class 속성 전체 문자열과 같으면 맞다
+    if isinstance(classes, str):
+        classes = classes.split()
+    wanted = [wanted] if isinstance(wanted, str) else wanted
+    return any(value in classes or value == " ".join(classes) for value in wanted)
+
+
+def _attrs_match(name, attrs, target):
+    tag_name, attr_name, attr_value = target
+    if name != tag_name:
+        return False
+    if attr_name is None:
+        return True
+    value = (attrs or {}).get(attr_name)
+    if value is None:
+        return False
+    if attr_name == 'class':
+        return _class_matches(value, attr_value)
+    return value == attr_value
+
+
+class SubtreeStrainer(SoupStrainer):
+    # BeautifulSoup(parse_only=...) 용. bs4 4.13 이상은 allow_tag_creation, 그 이전은 search_tag 로 묻는다
+    def __init__(self, targets):
+        super().__init__()
+        self.targets = list(targets)
+
+    def wants(self, name, attrs):
+        return any(_attrs_match(name, attrs, target) for target in self.targets)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self.wants(name, attrs)
+
+    def allow_string_creation(self, string):
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return markup_name if self.wants(markup_name, markup_attrs) else None
+
+
+def parse_html(html, targets=None):
+    # targets 가 없으면 문서 전체를 파싱한다
+    if not targets:
+        return BeautifulSoup(html, PARSER)
+    return BeautifulSoup(html, PARSER, parse_only=SubtreeStrainer(targets))
+
+
+def _tag_matches(tag, spec):
+    # spec: (태그 이름, 클래스) - 클래스가 None 이면 태그 이름만 본다
+    if spec is None or tag.name != spec[0]:
+        return False
+    return spec[1] is None or _class_matches(tag.get('class') or [], spec[1])
+
+
+def scan_subtree(root, text_match=None, image_match=None, text_within=None):
+    # root 아래를 문서 순서대로 한 번 돌며 (text_match 요소의 텍스트 목록, image_match 요소 목록) 을 돌려준다
+    # text_within 을 주면 그 요소 안에 있는 문단만 모은다. 빈 텍스트는 건너뛴다
+    texts = []
+    images = []
+    stack = [(child, text_within is None or _tag_matches(root, text_within)) for child in reversed(root.contents)]
+    while stack:
+        tag, inside = stack.pop()
+        if tag.name is None:
+            continue
+        if inside and _tag_matches(tag, text_match):
+            text = tag.get_text(strip=True)
+            if text:
+                texts.append(text)
+        if _tag_matches(tag, image_match):
+            images.append(tag)
+        inside = inside or _tag_matches(tag, text_within)
+        stack.extend((child, inside) for child in reversed(tag.contents))
+    return texts, images
+
+
+def extract_rows_from_soup(soup, row_selector, fields, page_url):
+    # browser.extract_rows 와 같은 fields 로 파싱한 목록 HTML 의 행을 읽는다
+    # 'text' 는 화면에 보이지 않는 요소(.displaynone)를 빼고 공백을 하나로 줄인 텍스트, 속성은 page_url 기준 절대 URL 로 바꾼다
+    for hidden in soup.select('.displaynone'):
+        hidden.decompose()
+    rows = []
+    for row in soup.select(row_selector):
+        values = {}
+        for key, (selector, what) in fields.items():
+            element = row.select_one(selector) if selector else row
+            if element is None:
+                values[key] = None
+            elif what == 'text':
+                values[key] = " ".join(element.get_text(" ").split())
+            else:
+                value = element.get(what)
+                values[key] = urljoin(page_url, value) if value is not None and what in ('src', 'href') else value
+        rows.append(values)
+    return rows
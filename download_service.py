@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import image_downloader
+from image_downloader import save_image
+from image_processing import ImageProcessor
+from image_store import get_store
+from rate_limiter import get_rate_limiter, MAX_HOST_CONCURRENCY
+from tracing import get_tracer
+
+# 크롤링 전체에서 하나만 띄우는 이미지 다운로드 서비스.
+# 크롤러는 submit() 으로 작업을 넘기고 바로 다음 상품으로 넘어가며, 다운로드는 백그라운드 이벤트 루프에서
+# 전체 동시성 한도와 호스트별 한도 안에서 처리된다.
+# post_process=True 면 저장된 파일을 image_processing 의 프로세스 풀로 넘겨 형식 수정과 WebP/축소본 생성을 한다.
+
+MAX_CONCURRENCY = 16
+PER_HOST_LIMIT = MAX_HOST_CONCURRENCY  # 상한만 둔다. 실제 호스트별 동시성은 rate_limiter 가 응답에 따라 조절
+POST_PROCESS_IMAGES = False  # True: 다운로드가 끝난 이미지를 후처리 (Pillow 필요)
+
+
+class DownloadService:
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, per_host_limit=PER_HOST_LIMIT, post_process=POST_PROCESS_IMAGES):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        # image_store 를 쓰면 후처리가 고친 파일을 저장소에 기록해, 다음 크롤링이 원본 blob 으로 되돌리지 않게 한다
+        self._processor = ImageProcessor(store=get_store() if image_downloader.USE_IMAGE_STORE else None) if post_process else None
+        self._loop = asyncio.new_event_loop()
+        # save_image 는 블로킹 I/O 이므로 루프의 기본 executor 크기를 전체 한도에 맞춘다
+        self._loop.set_default_executor(ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="image"))
+        self._thread = threading.Thread(target=self._loop.run_forever, name="download-service", daemon=True)
+        self._thread.start()
+        self._global_semaphore = asyncio.run_coroutine_threadsafe(self._make_semaphore(max_concurrency), self._loop).result()
+        self._host_semaphores = {}
+
+        self._lock = threading.Lock()
+        self._pending = {}  # future -> (image_url, filename, folder_path, tag)
+        # tag(순위) -> 실패한 작업. crawl_state 가 미완료 작업과 함께 저장해 --resume 때 다시 넘긴다
+        self._failed = defaultdict(list)
+        self.submitted = 0
+        self.completed = 0
+
+    async def _make_semaphore(self, value):
+        return asyncio.Semaphore(value)
+
+    def _host_semaphore(self, host):
+        # 루프 스레드 안에서만 호출된다
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphore
+
+    def _save(self, image_url, filename, folder_path, tag, submitted_at):
+        # executor 스레드에서 실행: 이미지 한 장을 image_download span 으로 잰다 (queue_ms: 한도 때문에 기다린 시간)
+        with get_tracer().span("image_download", product=tag, file=filename,
+                               queue_ms=round((time.perf_counter() - submitted_at) * 1000, 1)) as span:
+            file_path = save_image(image_url, filename, folder_path)
+            if file_path is None:
+                span.fail()
+            return file_path
+
+    async def _run(self, image_url, filename, folder_path, tag, submitted_at):
+        host = urlparse(image_url).netloc if image_url and not image_url.startswith("data:") else "data"
+        # 요청 간격은 save_image 안에서 rate_limiter 가 지킨다
+        async with self._global_semaphore, self._host_semaphore(host):
+            return await self._loop.run_in_executor(None, self._save, image_url, filename, folder_path, tag, submitted_at)
+
+    def submit(self, image_url, filename, folder_path, tag=None):
+        # concurrent.futures.Future 를 돌려준다. 결과는 저장된 파일 경로 또는 None(실패)
+        future = asyncio.run_coroutine_threadsafe(
+            self._run(image_url, filename, folder_path, tag, time.perf_counter()), self._loop)
+        with self._lock:
+            self._pending[future] = (image_url, filename, folder_path, tag)
+            self.submitted += 1
+        future.add_done_callback(lambda f: self._on_done(f, tag, filename, image_url, folder_path))
+        return future
+
+    def _on_done(self, future, tag, filename, image_url, folder_path):
+        try:
+            file_path = future.result()
+        except Exception:
+            file_path = None
+        ok = file_path is not None
+        if ok and self._processor is not None:
+            # 후처리는 다운로드 완료로 치지 않는다 (크롤링을 기다리게 하지 않음)
+            self._processor.submit(file_path)
+        with self._lock:
+            self._pending.pop(future, None)
+            self.completed += 1
+            if not ok:
+                self._failed[tag].append((image_url, filename, folder_path))
+        if not ok:
+            print(f"  > [순위 {tag}] {filename} 다운로드 실패, --resume 때 다시 받습니다: {image_url}")
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def failed_jobs(self):
+        with self._lock:
+            return [(tag, job) for tag, jobs in self._failed.items() for job in jobs]
+
+    def unfinished_jobs(self):
+        # 아직 끝나지 않았거나 실패한 작업 (crawl_state 에 저장해 재시작 때 다시 넘긴다)
+        with self._lock:
+            jobs = list(self._pending.values())
+            jobs.extend((image_url, filename, folder_path, tag)
+                        for tag, failed in self._failed.items()
+                        for image_url, filename, folder_path in failed)
+        return jobs
+
+    def wait(self, timeout=None):
+        # 지금까지 넘긴 작업이 모두 끝날 때까지 대기
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._lock:
+                pending = list(self._pending)
+            if not pending:
+                return True
+            for future in pending:
+                remaining = None if deadline is None else max(0, deadline - time.time())
+                try:
+                    future.result(timeout=remaining)
+                except Exception:
+                    pass
+            if deadline is not None and time.time() >= deadline:
+                return self.pending_count() == 0
+
+    def close(self):
+        self.wait()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.run_until_complete(self._loop.shutdown_default_executor())
+        self._loop.close()
+        if self._processor is not None:
+            self._processor.close()
+        failed = self.failed_jobs()
+        print(f"이미지 다운로드 서비스 종료: {self.completed}/{self.submitted}개 완료, 실패 {len(failed)}개")
+        failed_ranks = sorted({tag for tag, _ in failed}, key=str)
+        if failed_ranks:
+            print(f"  > 이미지가 빠진 순위: {', '.join(str(tag) for tag in failed_ranks)} (crawl_state 의 pending_images 에 기록)")
+        if image_downloader.USE_IMAGE_STORE:
+            store = get_store()
+            print(f"이미지 저장소: 이미 받은 URL 재사용 {store.hits}개, 304 재검증 {store.revalidated}개, 새 이미지 {store.new_blobs}개, 내용 중복 {store.duplicate_blobs}개")
+        print("호스트별 요청 조절 현황:")
+        for line in get_rate_limiter().summary():
+            print(line)
@@ -0,0 +1,243 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from browser import setup_driver, wait_for_element
+from crawl_state import CrawlState
+from detail_parser import parse_html
+from download_service import DownloadService
+from http_client import fetch_html
+from result_writer import open_result_writer
+from tracing import get_tracer
+
+# 네 크롤러가 공유하는 크롤링 엔진.
+# 사이트별 코드는 SiteAdapter 로 목록 읽기/페이지 넘기기(listing_pages)와 상세 파싱(extract_detail, crawl_detail,
+# 브라우저로 연 상세 페이지에서 파싱 전에 할 일 prepare_detail)만 정의하고,
+# 목록 브라우저, 상세 페이지 워커(HTTP + fallback 브라우저, 또는 브라우저 풀), 이미지 다운로드 서비스,
+# 결과 writer, 재시작 상태, 단계별 추적(tracing: 목록/페이지/상품/상세/파싱/쓰기 span)은 CrawlEngine 이 맡는다.
+
+DETAIL_WORKERS = 8  # 상세 페이지를 동시에 처리할 워커 수
+
+
+class SiteAdapter:
+    # 사이트마다 채우는 설정
+    site_name = None
+    fields = []
+    browser_profile = None  # 목록을 브라우저로 읽을 때 browser.PROFILES 의 프로필
+    fetch_mode = "http"  # "http": 상세를 HTTP 로 받고 검증 실패 시에만 브라우저, "browser": 워커마다 브라우저
+    detail_targets = None  # 상세 페이지에서 파싱할 부분 (detail_parser 의 대상 목록). None 이면 전체
+    detail_script = None  # 브라우저로 연 상세 페이지 안에서 extract_detail 과 같은 dict 를 돌려주는 JS. None 이면 page_source 를 파싱
+    detail_workers = DETAIL_WORKERS
+    start_page = 1
+    max_pages = None  # 목록을 이만큼만 처리하고 끝낸다 (benchmark.py 의 녹화/재생 등). None 이면 끝까지
+    restart_listing_on_resume = False  # 목록을 처음부터 다시 펼쳐야 하는 사이트('더보기' 등)는 재시작해도 1페이지부터
+    flush_every = 1
+    fsync_every = 20
+
+    def __init__(self, category_name, output_dir, thumbnail_dir, detail_images_dir, output_format="csv"):
+        self.category_name = category_name
+        self.output_dir = output_dir
+        self.thumbnail_dir = thumbnail_dir
+        self.detail_images_dir = detail_images_dir
+        self.output_format = output_format
+
+    def first_rank(self, page):
+        # 재시작이 아닐 때 page 의 첫 상품 순위
+        return 1
+
+    def listing_pages(self, engine, start_page):
+        # (페이지 번호, 상품 정보 목록) 을 차례로 돌려준다. 상품 정보에는 재시작 판단용 'id' 가 있어야 한다
+        raise NotImplementedError
+
+    def prepare_detail(self, driver):
+        # 브라우저로 연 상세 페이지에서 필드를 뽑기 전에 할 일 ('상세정보 펼쳐보기' 클릭 등). 기본은 없음
+        pass
+
+    def extract_detail(self, soup):
+        # 파싱한 상세 페이지에서 필드 dict 를 뽑는다 (detail_script 가 돌려주는 것과 같은 모양)
+        raise NotImplementedError
+
+    def crawl_detail(self, engine, product_info, rank, page):
+        # 상품 한 개의 결과 행(dict)을 돌려준다. 이미지는 engine.submit_image 로 넘긴다. 실패면 None
+        raise NotImplementedError
+
+
+class CrawlEngine:
+    def __init__(self, adapter, resume=False, download_service=None):
+        self.adapter = adapter
+        self.resume = resume
+        # 넘겨받은 서비스도 run() 이 끝나면 닫는다
+        self.download_service = download_service or DownloadService()
+        self._driver = None
+        self._fallback_driver = None
+        self._fallback_lock = threading.Lock()
+        self._detail_drivers = []
+        self._drivers_lock = threading.Lock()
+        self._thread_local = threading.local()
+
+    @property
+    def driver(self):
+        # 목록 페이지 전용 브라우저. 처음 쓸 때 띄운다
+        if self._driver is None:
+            self._driver = setup_driver(self.adapter.browser_profile, report=True)
+        return self._driver
+
+    def _worker_driver(self):
+        # browser 모드: 워커 스레드마다 브라우저 하나
+        driver = getattr(self._thread_local, 'driver', None)
+        if driver is None:
+            driver = self._thread_local.driver = setup_driver(self.adapter.browser_profile)
+            with self._drivers_lock:
+                self._detail_drivers.append(driver)
+        return driver
+
+    def _browser_detail(self, driver, url, ready_selector):
+        # detail_script 가 있으면 페이지 안에서 필드만 JSON 으로 받아 page_source 전송과 파싱을 건너뛴다
+        tracer = get_tracer()
+        with tracer.span("page_load", url=url):
+            driver.get(url)
+            if ready_selector:
+                wait_for_element(driver, ready_selector)
+        self.adapter.prepare_detail(driver)
+        if self.adapter.detail_script:
+            with tracer.span("parse", method="script") as span:
+                try:
+                    fields = driver.execute_script(self.adapter.detail_script)
+                    if fields:
+                        return fields
+                    span.fail("빈 결과")
+                    print("  > 페이지 안에서 상세 정보를 뽑지 못해 page_source 를 파싱합니다.")
+                except Exception as e:
+                    span.fail(e)
+                    print(f"  > 상세 추출 스크립트 실패, page_source 를 파싱합니다: {e}")
+        with tracer.span("parse", method="page_source"):
+            return self.adapter.extract_detail(parse_html(driver.page_source, self.adapter.detail_targets))
+
+    def fetch_detail(self, url, is_valid=None, ready_selector=None):
+        # 상세 페이지의 필드 dict (adapter.extract_detail 참고)
+        # http 모드: HTTP 로 받아 is_valid 로 검증하고, 실패하면 공용 fallback 브라우저로 다시 연다
+        # browser 모드: 워커 스레드의 브라우저로 연다
+        tracer = get_tracer()
+        with tracer.span("detail_fetch", url=url, mode=self.adapter.fetch_mode) as detail_span:
+            if self.adapter.fetch_mode == "http":
+                try:
+                    html = fetch_html(url)
+                    with tracer.span("parse", method="http"):
+                        soup = parse_html(html, self.adapter.detail_targets)
+                        if is_valid is None or is_valid(soup):
+                            return self.adapter.extract_detail(soup)
+                    print("  > HTTP 응답에서 상세 정보를 찾을 수 없어 브라우저로 다시 시도합니다.")
+                except Exception as e:
+                    print(f"  > 상세 페이지 HTTP 요청 실패, 브라우저로 다시 시도합니다: {e}")
+                detail_span.set(fallback=True)
+                with self._fallback_lock:
+                    if self._fallback_driver is None:
+                        self._fallback_driver = setup_driver(self.adapter.browser_profile)
+                    return self._browser_detail(self._fallback_driver, url, ready_selector)
+            return self._browser_detail(self._worker_driver(), url, ready_selector)
+
+    def submit_image(self, image_url, filename, folder_path, rank):
+        return self.download_service.submit(image_url, filename, folder_path, tag=rank)
+
+    def _crawl_one(self, ranked_product, page):
+        rank, product_info = ranked_product
+        with get_tracer().span("product", product=rank, page=page) as span:
+            try:
+                product_data = self.adapter.crawl_detail(self, product_info, rank, page)
+            except Exception as e:
+                span.fail(e)
+                print(f"  > [순위 {rank}] 상품 처리 중 오류 발생 ({product_info.get('name')}): {e}")
+                return rank, product_info, None
+            if product_data is None:
+                span.fail()
+                print(f"  > [순위 {rank}] 상품 처리 실패 ({product_info.get('name')})")
+                return rank, product_info, None
+        print(f"  > [순위 {rank}] 상품 처리 완료")
+        return rank, product_info, product_data
+
+    def run(self):
+        adapter = self.adapter
+        tracer = get_tracer()
+        tracer.start(adapter.site_name, adapter.category_name)
+        total_start_time = time.time()
+        print(f"{adapter.site_name}/{adapter.category_name} 크롤링 시작: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        # 출력 디렉토리는 크롤러 모듈을 import 할 때가 아니라 여기서 만든다 (configure/BASE_DIR 로 바꾼 경로에만 생기도록)
+        for path in (adapter.output_dir, adapter.thumbnail_dir, adapter.detail_images_dir):
+            os.makedirs(path, exist_ok=True)
+
+        crawl_state = CrawlState(adapter.output_dir, resume=self.resume, download_service=self.download_service)
+        result_writer = open_result_writer(
+            adapter.output_format, os.path.join(adapter.output_dir, "raw_data.csv"), adapter.site_name, adapter.category_name,
+            adapter.fields, flush_every=adapter.flush_every, fsync_every=adapter.fsync_every, append=crawl_state.resumed,
+        )
+        crawl_state.attach_writer(result_writer)
+        crawl_state.resubmit_pending_images()
+
+        if crawl_state.resumed and not adapter.restart_listing_on_resume:
+            start_page, rank = crawl_state.page, crawl_state.next_rank
+        else:
+            start_page = adapter.start_page
+            rank = adapter.first_rank(start_page)
+
+        executor = ThreadPoolExecutor(max_workers=adapter.detail_workers, thread_name_prefix="detail")
+        pages = adapter.listing_pages(self, start_page)
+        pages_done = 0
+        try:
+            while adapter.max_pages is None or pages_done < adapter.max_pages:
+                # 목록 한 페이지를 얻기까지 (프리페치가 있으면 기다린 시간만) 를 listing 구간으로 잰다
+                with tracer.span("listing") as listing_span:
+                    listed = next(pages, None)
+                    if listed is not None:
+                        listing_span.set(page=listed[0], products=len(listed[1]))
+                if listed is None:
+                    break
+                page, product_info_list = listed
+                print(f"\n======== {page} 페이지 크롤링 시작 ({len(product_info_list)}개) ========")
+                crawl_state.start_page(page, rank)
+
+                # 순위는 목록 순서로 정하고, 이전 실행에서 끝난 상품은 건너뛴다
+                ranked_products = [(rank + offset, product_info) for offset, product_info in enumerate(product_info_list)
+                                   if not crawl_state.is_done(product_info['id'])]
+                if len(ranked_products) < len(product_info_list):
+                    print(f"이미 완료된 상품 {len(product_info_list) - len(ranked_products)}개 건너뜀")
+                rank += len(product_info_list)
+
+                # 상세 페이지는 워커들이 동시에 처리하고, 결과는 순위 순으로 쓴다
+                written = 0
+                with tracer.span("page", page=page, products=len(ranked_products)):
+                    for product_rank, product_info, product_data in executor.map(lambda ranked: self._crawl_one(ranked, page), ranked_products):
+                        if product_data is None:
+                            continue
+                        with tracer.span("write", product=product_rank):
+                            # 완료 표시를 먼저 한다: 행이 파일로 flush 될 때 저장되는 상태에 이 상품이 들어가도록
+                            crawl_state.mark_done(product_info['id'])
+                            result_writer.write(product_data)
+                        written += 1
+                tracer.flush()
+                pages_done += 1
+                print(f"======== {page} 페이지 완료 ({written}/{len(ranked_products)}개, 누적 {result_writer.count}개, "
+                      f"이미지 대기 {self.download_service.pending_count()}개) ========")
+        finally:
+            pages.close()
+            executor.shutdown(wait=True)
+            for driver in self._detail_drivers + [self._fallback_driver, self._driver]:
+                if driver is None:
+                    continue
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+
+            print(f"남은 이미지 다운로드 대기 중... ({self.download_service.pending_count()}개)")
+            self.download_service.close()
+            # 상태 저장(결과 행 flush 포함) 후 남은 행을 디스크까지 저장
+            crawl_state.save()
+            result_writer.close()
+
+            total_duration = time.time() - total_start_time
+            tracer.count("products_total", result_writer.count)
+            tracer.count("crawl_seconds_total", total_duration)
+            print(f"\n========== 전체 크롤링 완료 ({result_writer.count}개 상품, {total_duration:.2f}초) ==========")
+            tracer.close()
+
+        return result_writer.count
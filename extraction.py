@@ -0,0 +1,32 @@
+import re
+
+# 상품 상세 텍스트에서 필드를 뽑는 규칙 엔진 (process_data.py 에서 사용).
+# 규칙은 (필드명, 정규식, 미리 확인할 키워드 목록) 으로 선언한다. 정규식의 첫 번째 그룹이 값이 되고 앞뒤 공백은 지운다.
+# ExtractionRules 가 규칙을 한 번만 컴파일하고, 문서마다 한 번 돌면서 모든 필드를 함께 뽑는다.
+# 키워드가 하나도 들어 있지 않은 문서는 그 규칙의 정규식을 돌리지 않는다 (부분 문자열 검사가 정규식 탐색보다 훨씬 싸다).
+#
+# 정규식을 쓸 때: '([^\n]+)\s*키워드' 처럼 앞쪽을 잡는 패턴은 모든 위치에서 시작해 줄 끝까지 되돌아가므로
+# 긴 상세 텍스트에서 줄 길이의 제곱만큼 느려진다. 같은 결과를 내는 '(?m)^([^\n]+)\s*키워드' 로 줄 시작에서만 시도한다.
+
+
+class ExtractionRules:
+    def __init__(self, rules, flags=re.DOTALL):
+        self.fields = [field for field, _, _ in rules]
+        self._compiled = [(re.compile(pattern, flags), tuple(keywords or ())) for _, pattern, keywords in rules]
+
+    def extract(self, text):
+        # 필드 순서대로 값의 튜플. 못 찾은 필드는 None
+        if not isinstance(text, str):
+            return (None,) * len(self._compiled)
+        values = []
+        for regex, keywords in self._compiled:
+            if keywords and not any(keyword in text for keyword in keywords):
+                values.append(None)
+                continue
+            matched = regex.search(text)
+            group_result = matched.group(1) if matched else None
+            values.append(group_result.strip() if group_result is not None else None)
+        return tuple(values)
+
+    def extract_all(self, texts):
+        return [self.extract(text) for text in texts]
@@ -0,0 +1,70 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from rate_limiter import get_rate_limiter
+from tracing import get_tracer
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+POOL_CONNECTIONS = 10  # 커넥션 풀을 유지할 호스트 수
+POOL_MAXSIZE = 20  # 호스트당 유지할 keep-alive 커넥션 수
+DEFAULT_TIMEOUT = (5, 20)  # (연결, 읽기) 초
+# 페이지(fetch_html)와 이미지(image_downloader) 요청이 함께 쓰는 재시도 정책
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # 재시도 대기: 0.5초, 1초, 2초 ...
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    # 모든 크롤러/스레드가 공유하는 Session. 호스트별 커넥션 풀을 재사용한다.
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+
+def backoff_delay(attempt):
+    # attempt 번째 재시도 전에 기다릴 시간(초)
+    return BACKOFF_BASE * (2 ** (attempt - 1))
+
+
+def fetch_html(url, timeout=DEFAULT_TIMEOUT):
+    # 연결 오류/시간 초과/RETRY_STATUS_CODES 응답은 backoff_delay 만큼 쉬고 MAX_RETRIES 번까지 다시 보낸다.
+    # 실패한 시도도 slot 으로 rate_limiter 에 알려지므로 그 호스트의 동시성/요청률이 줄어든다
+    with get_tracer().span("http_fetch", url=url) as span:
+        for attempt in range(MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(backoff_delay(attempt))
+            try:
+                with get_rate_limiter().request(url) as slot:
+                    response = get_session().get(url, timeout=timeout)
+                    slot.record(response)
+            except RETRY_EXCEPTIONS:
+                if attempt < MAX_RETRIES:
+                    continue
+                span.set(retries=attempt)
+                raise
+            if response.status_code not in RETRY_STATUS_CODES:
+                break
+        span.set(status=response.status_code, bytes=len(response.content), retries=attempt)
+        response.raise_for_status()
+    # 헤더에 charset이 없으면 requests가 ISO-8859-1로 가정하므로 본문 기준으로 다시 판단
+    if not response.encoding or response.encoding.lower() == "iso-8859-1":
+        response.encoding = response.apparent_encoding
+    return response.text
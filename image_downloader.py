@@ -0,0 +1,165 @@
+import base64
+import hashlib
+import os
+import re
+import tempfile
+import time
+import requests
+from http_client import get_session, backoff_delay, MAX_RETRIES, RETRY_STATUS_CODES, RETRY_EXCEPTIONS
+from rate_limiter import get_rate_limiter
+from image_store import get_store, url_extension
+from tracing import get_tracer
+
+# 네 크롤러가 공유하는 이미지 다운로더.
+# http_client 의 Session(호스트별 keep-alive 커넥션 풀)을 재사용하고, 임시 파일에 스트리밍으로 쓴 뒤 원자적으로 rename 한다.
+# USE_IMAGE_STORE 가 켜져 있으면 본문은 image_store 에 해시로 한 번만 저장하고, 요청한 파일명은 그 blob 에 링크한다.
+# 재크롤링 때는 저장된 ETag/Last-Modified 로 조건부 GET 을 보내 304 면 기존 파일을 그대로 쓴다.
+
+DOWNLOAD_TIMEOUT = (5, 30)  # (연결, 읽기) 초
+CHUNK_SIZE = 64 * 1024
+USE_IMAGE_STORE = True
+
+_DATA_URI_RE = re.compile(r"data:image/(png|jpeg|jpg|gif|webp);base64,(.*)", re.DOTALL)
+
+
+def normalize_image_url(image_url):
+    if image_url.startswith("//"):
+        return "https:" + image_url
+    return image_url
+
+
+def _write_atomic(file_path, chunks, expected_size=None):
+    # 같은 디렉토리에 임시 파일로 쓴 뒤 os.replace 로 교체: 중간에 실패해도 깨진 파일이 남지 않는다
+    # 쓰는 동안 sha256 을 함께 계산해 (digest, size) 를 돌려준다
+    # expected_size 와 길이가 다르면(끊긴 응답) 교체하지 않고 임시 파일을 지운 뒤 ChunkedEncodingError
+    folder_path = os.path.dirname(file_path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=folder_path, prefix=".", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as out_file:
+            for chunk in chunks:
+                if chunk:
+                    out_file.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+        if expected_size is not None and size != expected_size:
+            raise requests.exceptions.ChunkedEncodingError(f"본문 길이 불일치 ({size}/{expected_size})")
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return digest.hexdigest(), size
+
+
+def _response_validators(response):
+    content_length = response.headers.get('Content-Length')
+    return {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'content_length': int(content_length) if content_length and content_length.isdigit() else None,
+    }
+
+
+def _download(image_url, file_path, cached=None):
+    # (digest, size, validators) 를 돌려준다. cached 항목이 있으면 조건부 GET 을 보내고, 304 면 None
+    session = get_session()
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    last_error = None
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(backoff_delay(attempt))
+        try:
+            # 호스트별 슬롯을 받아 요청하고, 응답 상태/시간을 rate_limiter 에 알려 동시성/요청률을 조절한다
+            with get_rate_limiter().request(image_url) as slot, \
+                    session.get(image_url, stream=True, timeout=DOWNLOAD_TIMEOUT, headers=headers) as response:
+                slot.record(response)
+                if response.status_code == 304 and cached:
+                    return None
+                if response.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+                    last_error = requests.exceptions.HTTPError(f"{response.status_code} 응답", response=response)
+                    continue
+                response.raise_for_status()
+                validators = _response_validators(response)
+                # 압축 전송이 아닌데 길이가 다르면 중간에 끊긴 응답이므로 파일을 두지 않고 다시 받는다 (마지막 시도면 예외)
+                expected = None if response.headers.get('Content-Encoding') else validators['content_length']
+                digest, size = _write_atomic(file_path, response.iter_content(chunk_size=CHUNK_SIZE), expected_size=expected)
+                # 받은 바이트와 재시도 횟수를 다운로드 서비스의 image_download span 에 남긴다
+                get_tracer().annotate(bytes=size, retries=attempt)
+                return digest, size, validators
+        except RETRY_EXCEPTIONS as e:
+            last_error = e
+    get_tracer().annotate(retries=MAX_RETRIES)
+    raise last_error
+
+
+def save_image(image_url, filename, folder_path):
+    # 저장에 성공하면 파일 경로, 실패하면 None 을 돌려준다
+    if not image_url:
+        print(f"  > 이미지 URL 이 비어 있습니다: {filename}")
+        return None
+    image_url = normalize_image_url(image_url)
+    file_path = os.path.join(folder_path, filename)
+
+    try:
+        if image_url.startswith("data:image"):
+            match = _DATA_URI_RE.match(image_url)
+            if not match:
+                print(f"  > BASE64 형식 불일치: {image_url[:50]}...")
+                return None
+            chunks = [base64.b64decode(match.group(2))]
+            ext = "." + match.group(1).replace("jpeg", "jpg")
+            if USE_IMAGE_STORE:
+                # data URI 는 URL 자체가 내용이므로 인덱스에 남기지 않고 blob 만 공유한다
+                store = get_store()
+                staging_path = store.staging_path()
+                digest, size = _write_atomic(staging_path, chunks)
+                store.link(store.add(staging_path, digest, size, ext=ext), file_path)
+            else:
+                _write_atomic(file_path, chunks)
+        elif USE_IMAGE_STORE:
+            store = get_store()
+            cached = store.lookup(image_url)
+            if cached is not None and store.is_fresh(cached):
+                # 최근에 확인한 URL: 네트워크 요청 없이 재사용
+                store.mark_hit()
+                blob_path = cached['blob_path']
+            else:
+                staging_path = store.staging_path()
+                try:
+                    downloaded = _download(image_url, staging_path, cached=cached)
+                except BaseException:
+                    if os.path.exists(staging_path):
+                        os.remove(staging_path)
+                    raise
+                if downloaded is None:
+                    # 304 Not Modified: 저장된 blob 재사용
+                    os.remove(staging_path)
+                    store.mark_revalidated(image_url)
+                    blob_path = cached['blob_path']
+                else:
+                    digest, size, validators = downloaded
+                    blob_path = store.add(staging_path, digest, size, image_url=image_url,
+                                          ext=url_extension(image_url), validators=validators)
+            store.link(blob_path, file_path)
+        else:
+            _download(image_url, file_path)
+
+        if os.path.getsize(file_path) == 0:
+            print(f"  > 경고: {filename} 파일이 0KB로 저장되었습니다. (URL: {image_url})")
+        return file_path
+
+    except requests.exceptions.RequestException as e:
+        status_code_info = f"상태 코드: {e.response.status_code}" if e.response is not None else "상태 코드 없음"
+        print(f"  > 이미지 다운로드 오류 ({image_url}): {e} ({status_code_info})")
+    except Exception as e:
+        print(f"  > 이미지 처리 중 예상치 못한 오류 발생 ({image_url}): {e}")
+    return None
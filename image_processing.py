@@ -0,0 +1,238 @@
+import argparse
+import csv
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from image_store import STORE_DIR, get_store
+
+# 저장된 이미지의 후처리 (선택, Pillow 필요).
+# 다운로드가 끝난 파일을 프로세스 풀에 넘겨 크롤링과 따로 처리한다:
+#   - 확장자와 실제 형식이 다르면(.jpg 이름의 PNG/WebP/GIF 등) 확장자에 맞는 형식으로 다시 저장
+#   - <폴더>/derived/ 에 WebP 변환본(<이름>.webp)과 긴 변 DERIVATIVE_SIZES 픽셀 축소본(<이름>_<크기>.webp) 생성
+#   - 파일마다 sha256, 형식, 가로/세로, 바이트 수를 <폴더>/images.csv 에 기록 (결과 행과는 파일명으로 연결)
+# images.csv 의 sha256 과 내용이 같고 파생 파일이 모두 있으면 다시 처리하지 않는다.
+# image_store 를 넘기면 형식을 고친 파일을 저장소에 blob 으로 남겨, 다음 크롤링이 원본 blob 을 다시 링크하지 않게 한다.
+
+DERIVED_DIR_NAME = "derived"
+MANIFEST_FILENAME = "images.csv"
+MANIFEST_FIELDS = ['파일명', 'sha256', '형식', '가로', '세로', '바이트', '원래 형식', '원본 sha256', '파생 파일']
+DERIVATIVE_SIZES = (300, 800)  # 축소본의 긴 변 (원본이 더 작으면 만들지 않음)
+WEBP_QUALITY = 80
+JPEG_QUALITY = 90
+PROCESS_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# 확장자 -> Pillow 형식 이름
+EXTENSION_FORMATS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.gif': 'GIF', '.webp': 'WEBP'}
+# 다른 이름으로 읽히지만 확장자와 같은 형식으로 보는 것 (MPO: 카메라 JPEG)
+FORMAT_ALIASES = {'MPO': 'JPEG'}
+
+
+def _import_pil():
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("이미지 후처리에는 Pillow 가 필요합니다: pip install Pillow")
+    return Image
+
+
+def _file_digest(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _save_atomic(image, file_path, image_format, **params):
+    # 하드링크된 image_store blob 을 건드리지 않도록 새 파일로 쓴 뒤 이름만 교체한다
+    folder_path = os.path.dirname(file_path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=folder_path, prefix=".", suffix=".part")
+    os.close(fd)
+    try:
+        image.save(tmp_path, image_format, **params)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _to_rgb(Image, image):
+    # JPEG 로 저장할 수 있게 RGB 로 바꾼다. 투명한 부분은 흰 배경
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        rgba = image.convert('RGBA')
+        background = Image.new('RGB', rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def derivative_names(filename, width, height):
+    # derived/ 아래에 만들 파일 이름들: 전체 크기 WebP + 원본보다 작은 축소본
+    stem = os.path.splitext(filename)[0]
+    names = [f"{stem}.webp"]
+    names.extend(f"{stem}_{size}.webp" for size in DERIVATIVE_SIZES if max(width, height) > size)
+    return names
+
+
+def process_image(file_path, previous=None):
+    # 워커 프로세스에서 실행된다. (images.csv 에 쓸 행(dict), 새로 처리했는지) 를 돌려준다
+    # previous: 지난번 images.csv 행. 내용(sha256)이 같고 파생 파일이 모두 있으면 그 행을 그대로 돌려준다
+    folder_path, filename = os.path.split(file_path)
+    derived_dir = os.path.join(folder_path, DERIVED_DIR_NAME)
+    digest = _file_digest(file_path)
+    if previous and previous['sha256'] == digest and all(
+            os.path.exists(os.path.join(derived_dir, name)) for name in previous['파생 파일'].split(';') if name):
+        return previous, False
+
+    Image = _import_pil()
+    original_format = None
+    source_digest = ""
+    with Image.open(file_path) as image:
+        image.load()
+        image_format = FORMAT_ALIASES.get(image.format, image.format)
+        expected_format = EXTENSION_FORMATS.get(os.path.splitext(filename)[1].lower())
+        if expected_format and image_format != expected_format:
+            # 예: .jpg 이름으로 저장된 PNG/WebP/GIF(첫 프레임) -> JPEG 로 다시 저장
+            original_format = image_format
+            source_digest = digest
+            if expected_format == 'JPEG':
+                _save_atomic(_to_rgb(Image, image), file_path, 'JPEG', quality=JPEG_QUALITY)
+            else:
+                _save_atomic(image, file_path, expected_format)
+            image_format = expected_format
+            digest = _file_digest(file_path)
+
+        width, height = image.size
+        webp_source = image if image.mode in ('RGB', 'RGBA') else image.convert('RGBA')
+        os.makedirs(derived_dir, exist_ok=True)
+        names = derivative_names(filename, width, height)
+        for name in names:
+            derived = webp_source
+            size = os.path.splitext(name)[0].rsplit('_', 1)[-1]
+            if name != names[0]:
+                derived = webp_source.copy()
+                derived.thumbnail((int(size), int(size)))
+            _save_atomic(derived, os.path.join(derived_dir, name), 'WEBP', quality=WEBP_QUALITY)
+
+    return {
+        '파일명': filename,
+        'sha256': digest,
+        '형식': image_format,
+        '가로': width,
+        '세로': height,
+        '바이트': os.path.getsize(file_path),
+        '원래 형식': original_format or "",
+        '원본 sha256': source_digest,
+        '파생 파일': ";".join(names),
+    }, True
+
+
+def load_manifest(folder_path):
+    manifest_path = os.path.join(folder_path, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, encoding='utf-8-sig', newline='') as f:
+        return {row['파일명']: row for row in csv.DictReader(f)}
+
+
+def save_manifest(folder_path, rows):
+    manifest_path = os.path.join(folder_path, MANIFEST_FILENAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=MANIFEST_FIELDS)
+        writer.writeheader()
+        for filename in sorted(rows):
+            writer.writerow(rows[filename])
+    os.replace(tmp_path, manifest_path)
+
+
+class ImageProcessor:
+    # 다운로드 서비스가 저장을 마친 파일을 submit() 하면 프로세스 풀에서 처리하고, close() 때 폴더별 images.csv 를 쓴다
+    # store: image_store.ImageStore. 주면 형식을 고친 파일을 저장소에 기록한다
+    def __init__(self, workers=PROCESS_WORKERS, store=None):
+        _import_pil()
+        self._store = store
+        # 크롤러 프로세스는 스레드가 많으므로 fork 대신 spawn 으로 워커를 띄운다
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self._lock = threading.Lock()
+        self._manifests = {}  # 폴더 -> {파일명: 행}
+        self._futures = set()
+        self.processed = 0
+        self.skipped = 0
+        self.fixed = 0
+        self.failed = 0
+
+    def _manifest(self, folder_path):
+        with self._lock:
+            manifest = self._manifests.get(folder_path)
+            if manifest is None:
+                manifest = self._manifests[folder_path] = load_manifest(folder_path)
+            return manifest
+
+    def submit(self, file_path):
+        folder_path, filename = os.path.split(file_path)
+        previous = self._manifest(folder_path).get(filename)
+        future = self._executor.submit(process_image, file_path, previous)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(lambda f: self._on_done(f, folder_path, filename))
+        return future
+
+    def _on_done(self, future, folder_path, filename):
+        try:
+            row, changed = future.result()
+        except Exception as e:
+            print(f"  > 이미지 후처리 실패 ({os.path.join(folder_path, filename)}): {e}")
+            row = None
+        if row is not None and changed and row['원본 sha256'] and self._store is not None:
+            try:
+                self._store.record_fixed(row['원본 sha256'], os.path.join(folder_path, filename), row['sha256'])
+            except OSError as e:
+                print(f"  > 수정한 이미지를 저장소에 기록하지 못했습니다 ({os.path.join(folder_path, filename)}): {e}")
+        with self._lock:
+            self._futures.discard(future)
+            if row is None:
+                self.failed += 1
+                return
+            self._manifests[folder_path][filename] = row
+            if not changed:
+                self.skipped += 1
+            else:
+                self.processed += 1
+                if row['원래 형식']:
+                    self.fixed += 1
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for folder_path, rows in self._manifests.items():
+                save_manifest(folder_path, rows)
+        print(f"이미지 후처리: 처리 {self.processed}개 (형식 수정 {self.fixed}개), 변경 없음 {self.skipped}개, 실패 {self.failed}개")
+
+
+def process_folders(folder_paths, workers=PROCESS_WORKERS, store=None):
+    # 이미 저장된 썸네일/상세사진 폴더를 한 번에 처리 (바뀐 파일만)
+    start_time = time.time()
+    processor = ImageProcessor(workers, store=store)
+    for folder_path in folder_paths:
+        for filename in sorted(os.listdir(folder_path)):
+            if os.path.splitext(filename)[1].lower() in EXTENSION_FORMATS and not filename.startswith("."):
+                processor.submit(os.path.join(folder_path, filename))
+    processor.close()
+    print(f"소요시간: {time.time() - start_time:.2f}초")
+
+
+if __name__ == "__main__":
+    # python image_processing.py scarf_muffler/썸네일 scarf_muffler/상세사진 [--workers N]
+    parser = argparse.ArgumentParser(description="저장된 이미지의 형식 수정, WebP/축소본 생성, images.csv 기록")
+    parser.add_argument("folders", nargs="+")
+    parser.add_argument("--workers", type=int, default=PROCESS_WORKERS)
+    args = parser.parse_args()
+    # 크롤러가 image_store 를 써 왔으면 고친 파일을 저장소에도 기록한다
+    store = get_store() if os.path.isdir(STORE_DIR) else None
+    process_folders(args.folders, args.workers, store=store)
@@ -0,0 +1,204 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+# 내용 주소(content-addressed) 이미지 저장소.
+# 이미지 본문은 sha256 으로 한 번만 blobs/ab/abcdef....jpg 에 저장하고,
+# 크롤러가 쓰는 썸네일/상세사진 파일명은 blob 에 대한 하드링크(안 되면 복사)로 만든다.
+# URL -> 해시 인덱스(index.sqlite3)가 있어 이미 받은 URL 은 네트워크 요청 없이 건너뛴다.
+# 인덱스에는 ETag / Last-Modified / Content-Length 도 함께 남겨, 오래된 항목은 조건부 GET 으로 재검증한다.
+# image_processing 이 형식을 고친 파일은 고친 내용을 blob 으로 따로 두고 (원본 해시, 확장자) -> 고친 해시를 기록해,
+# 다음 크롤링에서 같은 원본을 링크할 때 원본 대신 고친 blob 을 링크한다 (후처리 결과가 되돌려지지 않게).
+# 오케스트레이터가 동시에 돌리는 여러 프로세스가 같은 저장소를 쓰므로 인덱스는 WAL 모드로 열고, 잠겨 있으면 BUSY_TIMEOUT 까지 기다린다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(BASE_DIR, "image_store")
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+REVALIDATE_AFTER = 6 * 60 * 60  # 마지막 확인 후 이 시간(초)이 지나면 조건부 GET 으로 다시 확인
+BUSY_TIMEOUT = 30  # 다른 프로세스(오케스트레이터의 동시 작업)가 인덱스를 쓰는 중일 때 기다리는 최대 시간(초)
+
+_INDEX_COLUMNS = {
+    'etag': 'TEXT',
+    'last_modified': 'TEXT',
+    'content_length': 'INTEGER',
+    'checked_at': 'REAL',
+}
+
+
+def url_extension(image_url, default=".jpg"):
+    ext = os.path.splitext(urlparse(image_url).path)[1].lower()
+    return ext if ext in IMAGE_EXTENSIONS else default
+
+
+class ImageStore:
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = store_dir
+        self.blob_dir = os.path.join(store_dir, "blobs")
+        self.staging_dir = os.path.join(store_dir, "staging")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.staging_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(store_dir, "index.sqlite3"), timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT * 1000}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS url_index ("
+            " url TEXT PRIMARY KEY, sha256 TEXT NOT NULL, ext TEXT NOT NULL, size INTEGER, fetched_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fixed_blobs ("
+            " source TEXT NOT NULL, ext TEXT NOT NULL, sha256 TEXT NOT NULL, PRIMARY KEY (source, ext))"
+        )
+        # 이전 버전 인덱스에 검증용 컬럼 추가
+        existing_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(url_index)")}
+        for column, column_type in _INDEX_COLUMNS.items():
+            if column not in existing_columns:
+                try:
+                    self._conn.execute(f"ALTER TABLE url_index ADD COLUMN {column} {column_type}")
+                except sqlite3.OperationalError:
+                    pass  # 동시에 시작한 다른 프로세스가 먼저 추가했다
+        self._conn.commit()
+
+        self.hits = 0  # URL 인덱스로 다운로드를 건너뛴 횟수
+        self.revalidated = 0  # 조건부 GET 에 304 를 받아 저장된 파일을 재사용한 횟수
+        self.new_blobs = 0
+        self.duplicate_blobs = 0  # 새로 받았지만 이미 같은 내용의 blob 이 있던 횟수
+
+    def blob_path(self, digest, ext):
+        return os.path.join(self.blob_dir, digest[:2], digest + ext)
+
+    def lookup(self, image_url):
+        # 이미 받은 URL 이면 인덱스 항목(dict), 아니면 None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256, ext, etag, last_modified, content_length, COALESCE(checked_at, fetched_at)"
+                " FROM url_index WHERE url = ?", (image_url,)
+            ).fetchone()
+        if row is None:
+            return None
+        blob_path = self.blob_path(row[0], row[1])
+        if not os.path.exists(blob_path):
+            return None
+        return {
+            'blob_path': blob_path,
+            'etag': row[2],
+            'last_modified': row[3],
+            'content_length': row[4],
+            'checked_at': row[5] or 0,
+        }
+
+    def is_fresh(self, entry):
+        return time.time() - entry['checked_at'] < REVALIDATE_AFTER
+
+    def mark_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def mark_revalidated(self, image_url):
+        # 304 응답: 저장된 blob 을 그대로 쓰고 확인 시각만 갱신
+        with self._lock:
+            self.revalidated += 1
+            self._conn.execute("UPDATE url_index SET checked_at = ? WHERE url = ?", (time.time(), image_url))
+            self._conn.commit()
+
+    def staging_path(self):
+        fd, path = tempfile.mkstemp(dir=self.staging_dir, suffix=".part")
+        os.close(fd)
+        return path
+
+    def add(self, staging_path, digest, size, image_url=None, ext=".jpg", validators=None):
+        # 다운로드가 끝난 staging 파일을 blob 으로 옮기고 URL 인덱스에 기록
+        # validators: 응답의 {'etag', 'last_modified', 'content_length'}
+        blob_path = self.blob_path(digest, ext)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        with self._lock:
+            if os.path.exists(blob_path):
+                os.remove(staging_path)
+                self.duplicate_blobs += 1
+            else:
+                os.replace(staging_path, blob_path)
+                self.new_blobs += 1
+            if image_url is not None:
+                validators = validators or {}
+                now = time.time()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO url_index"
+                    " (url, sha256, ext, size, fetched_at, etag, last_modified, content_length, checked_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (image_url, digest, ext, size, now,
+                     validators.get('etag'), validators.get('last_modified'), validators.get('content_length'), now),
+                )
+                self._conn.commit()
+        return blob_path
+
+    def record_fixed(self, source_digest, file_path, digest):
+        # 후처리가 형식을 고친 file_path(내용 해시 digest)를 blob 으로 저장하고 원본 blob 과 연결한다
+        ext = os.path.splitext(file_path)[1].lower()
+        blob_path = self.blob_path(digest, ext)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        with self._lock:
+            if not os.path.exists(blob_path):
+                tmp_path = os.path.join(self.staging_dir, f"{digest}.{threading.get_ident()}.fixed")
+                try:
+                    os.link(file_path, tmp_path)
+                except OSError:
+                    shutil.copyfile(file_path, tmp_path)
+                os.replace(tmp_path, blob_path)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fixed_blobs (source, ext, sha256) VALUES (?, ?, ?)",
+                (source_digest, ext, digest),
+            )
+            self._conn.commit()
+        return blob_path
+
+    def _fixed_blob(self, blob_path, file_path):
+        # 원본 blob 을 file_path 의 확장자로 고친 blob 이 있으면 그 경로, 없으면 원본 그대로
+        source_digest = os.path.splitext(os.path.basename(blob_path))[0]
+        ext = os.path.splitext(file_path)[1].lower()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256 FROM fixed_blobs WHERE source = ? AND ext = ?", (source_digest, ext)
+            ).fetchone()
+        if row is not None:
+            fixed_path = self.blob_path(row[0], ext)
+            if os.path.exists(fixed_path):
+                return fixed_path
+        return blob_path
+
+    def link(self, blob_path, file_path):
+        # 상품별 파일명을 blob 에 연결한다. 같은 파일이면 그대로 두고, 아니면 임시 이름으로 링크 후 교체
+        # 후처리가 형식을 고친 적 있는 blob 이면 고친 blob 을 링크한다
+        blob_path = self._fixed_blob(blob_path, file_path)
+        if os.path.exists(file_path) and os.path.samefile(blob_path, file_path):
+            return file_path
+        folder_path = os.path.dirname(file_path) or "."
+        tmp_path = os.path.join(folder_path, f".{os.path.basename(file_path)}.{threading.get_ident()}.link")
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError:
+            # 다른 드라이브 등 하드링크가 안 되는 경우 복사
+            shutil.copyfile(blob_path, tmp_path)
+        os.replace(tmp_path, file_path)
+        return file_path
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ImageStore()
+    return _store
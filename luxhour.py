@@ -1,18 +1,7 @@
 import os
-import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import requests
-import pandas as pd
-from bs4 import BeautifulSoup
-import base64
-import re
-from webdriver_manager.chrome import ChromeDriverManager
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+from engine import CrawlEngine
+from smartstore import SmartstoreAdapter
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CATEGORY_DIR = os.path.join(BASE_DIR, "luxhour")
@@ -20,262 +9,63 @@ CAT_OUTPUT_DIR = os.path.join(CATEGORY_DIR, "all_output")
 THUMBNAIL_DIR = os.path.join(CATEGORY_DIR, "썸네일")
 DETAIL_IMAGES_DIR = os.path.join(CATEGORY_DIR, "상세사진")
 
-if not os.path.exists(CAT_OUTPUT_DIR):
-    os.makedirs(CAT_OUTPUT_DIR)
-if not os.path.exists(THUMBNAIL_DIR):
-    os.makedirs(THUMBNAIL_DIR)
-if not os.path.exists(DETAIL_IMAGES_DIR):
-    os.makedirs(DETAIL_IMAGES_DIR)
-
-def setup_driver():
-    chrome_options = ChromeOptions()
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    user_agent_string = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    chrome_options.add_argument(f"user-agent={user_agent_string}")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
-    chrome_options.add_argument("--incognito")
-    chrome_options.page_load_strategy = 'normal'
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.set_window_size(1200, 800)
-    return driver
-
-def sanitize_filename(filename):
-    return re.sub(r'[<>:"/\\|?*]', '_', filename)
-
-def clean_image_url(url, base_url):
-    if not url:
-        return None
-    
-    if url.startswith("data:image"):
-        return url
-    elif url.startswith("//"):
-        return "https:" + url
-    elif url.startswith("/"):
-        return base_url.rstrip('/') + url
-    else:
-        return url
-
-def save_image(image_url, filename, folder_path):
-    file_path = os.path.join(folder_path, filename)
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    
-    try:
-        if image_url.startswith("data:image"):
-            match = re.match(r"data:image/(png|jpeg|jpg);base64,(.*)", image_url)
-            if match:
-                image_bytes = base64.b64decode(match.group(2))
-                with open(file_path, 'wb') as out_file:
-                    out_file.write(image_bytes)
-            else:
-                pass
-        else:
-            response = requests.get(image_url, stream=True, headers=headers)
-            response.raise_for_status()
-            with open(file_path, 'wb') as out_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    out_file.write(chunk)
-        
-        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-            pass
-        else:
-            pass
-    except requests.exceptions.RequestException as e:
-        status_code_info = f"상태 코드: {e.response.status_code}" if e.response is not None else "상태 코드 없음"
-    except Exception as e:
-        pass
-
-def get_product_details(driver, product_info_list, product_url, product_name_on_list, product_price_on_list, thumbnail_url, thumbnail_counter, base_url, current_page_number):
-    product_data = {
-        '순위': thumbnail_counter,
-        '페이지': current_page_number,
-        '상품명': product_name_on_list,
-        '썸네일 이미지 파일명': f"{thumbnail_counter}.jpg",
-        '가격': product_price_on_list,
-        '상품 상세': None,
-        '상세 이미지 파일명': []
-    }
-
-    driver.get(product_url)
-    
-    try:
-        try:
-            expand_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, '//*[@id="INTRODUCE"]/div/div[3]/button'))
-            )
-            expand_button.click()
-            print("'상세정보 펼쳐보기' 버튼을 클릭 완료")
-        except:
-            print("버튼을 찾지 못했습니다. 페이지 중간까지 스크롤을 시도합니다.")
-            try:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
-                time.sleep(1) 
-                expand_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, '//*[@id="INTRODUCE"]/div/div[3]/button'))
-                )
-                expand_button.click()
-                print("스크롤 후 '상세정보 펼쳐보기' 버튼을 클릭 완료")
-            except Exception as e:
-                print(f"스크롤 후에도 버튼을 찾을 수 없습니다: {e}")
-
-        detail_extraction_start = time.time()
-        
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        introduce_div = soup.find('div', id='INTRODUCE')
-        description_texts = []
-        if introduce_div:
-            desc_container = introduce_div.find('div', class_='LXGzUhHJC2')
-            if desc_container:
-                p_tags = desc_container.find_all('p')
-                if p_tags:
-                    for p_tag in p_tags:
-                        cleaned_text = p_tag.get_text(strip=True)
-                        if cleaned_text:
-                            description_texts.append(cleaned_text)
-        product_data['상품 상세'] = "\n".join(description_texts) if description_texts else None
-        detail_extraction_end = time.time()
-        print(f"상품 상세 정보 추출 완료 - 소요시간: {detail_extraction_end - detail_extraction_start:.2f}초")
-    except Exception as e:
-        print(f"상품 상세 정보 추출 중 오류 발생: {e}")
-        return None
-
-    image_collection_start = time.time()
-    all_detail_images_tags = introduce_div.find_all('a', class_="se-module-image-link __se_image_link __se_link")
-    detail_image_urls = []
-
-    for a_tag in all_detail_images_tags:
-        # <a> 태그 안에서 <img> 태그를 찾습니다.
-        img_tag = a_tag.find('img')
-        
-        if img_tag:
-            # <img> 태그에서 'data-src' 또는 'src' 속성을 가져옵니다.
-            img_to_process = img_tag.get('data-src') or img_tag.get('src')
-            if img_to_process:
-                detail_image_urls.append(img_to_process)
-                
-    detail_image_urls = detail_image_urls[:-1]
-
-    save_image(detail_image_urls[0], product_data['썸네일 이미지 파일명'], THUMBNAIL_DIR)
-    print(f"썸네일 저장 완료: {product_data['썸네일 이미지 파일명']}")
-
-    for i, img_url in enumerate(detail_image_urls, 1):
-        filename = f"{thumbnail_counter}_{i}.jpg"
-        save_image(img_url, filename, DETAIL_IMAGES_DIR)
-        product_data['상세 이미지 파일명'].append(filename)
-        print(f"상세 이미지 저장 완료: {filename}")
-
-    image_collection_end = time.time()
-    print(f"상세 이미지 URL 수집 및 저장 완료 ({len(detail_image_urls)}개) - {image_collection_end - image_collection_start:.2f}초")
-    
-    return product_data
-
-def main():
-    total_start_time = time.time()
-    print("크롤링을 시작합니다.")
-    driver = setup_driver()
-    
-    current_page_number = 1
-    thumbnail_counter = 1
-    
-    csv_path = os.path.join(CAT_OUTPUT_DIR, "raw_data.csv")
-    
-    if os.path.exists(csv_path):
-        os.remove(csv_path)
-        print(f"기존 CSV 파일 '{csv_path}'을(를) 삭제했습니다.")
-    
-    cumulative_data = []
-
-    try:
-        while True:
-            base_url = f"https://smartstore.naver.com/luxhour/category/018f26729d6b4887be02b37c5167953a?st=POPULAR&dt=BIG_IMAGE&page={current_page_number}&size=80&filters=oa"
-            print(f"사이트에 접속합니다: {base_url}")
-            driver.get(base_url)
-
-            print(f"\n======== {current_page_number} 페이지 크롤링 시작 ========")
-            try:
-                WebDriverWait(driver, 30).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "li.Hz4XxKbt9h"))
-                )
-                print("PASSING~")
-            except Exception as e:
-                print("더 이상 상품이 없거나 페이지 로딩 오류로 인해 크롤링을 종료합니다.")
-                break
-
-            product_elements = driver.find_elements(By.CSS_SELECTOR, "li.Hz4XxKbt9h")
-            if not product_elements:
-                print("상품 목록을 찾을 수 없어 크롤링을 종료합니다.")
-                break
-
-            product_info_list = []
-            for i, product in enumerate(product_elements):
-                try:
-                    thumbnail_elements = product.find_elements(By.CSS_SELECTOR, "img.eGeLGHztiu")
-                    if thumbnail_elements:
-                        thumbnail_url = thumbnail_elements[0].get_attribute('src')
-                    
-                    product_name_element = product.find_element(By.CSS_SELECTOR, 'strong.xSW7C99vO3')
-                    price_element = product.find_element(By.CSS_SELECTOR, 'div.RIs7NC5ZLT')
-                    price_text = price_element.text.strip()
-                    product_price = int(price_text.replace('원', '').replace(',', '').strip())
-                    product_name = product_name_element.text.strip()
-                    product_link_element = product.find_element(By.XPATH, ".//a[contains(@data-shp-area, 'list.pd')]")
-                    product_url = product_link_element.get_attribute('href')
-                    
-                    product_info_list.append({
-                        'index': i,
-                        'name': product_name,
-                        'price': product_price,
-                        'thumbnail_url': thumbnail_url,
-                        'product_url': product_url
-                    })
-                except Exception as e:
-                    print(f"상품 목록 정보 추출 중 오류: {e}")
-                    continue
-            
-            print(f"현재 페이지에서 {len(product_info_list)}개의 상품 정보를 수집했습니다.")
-
-            for product_info in product_info_list:
-                try:
-                    product_data = get_product_details(
-                        driver, 
-                        product_info_list,
-                        product_info['product_url'], 
-                        product_info['name'], 
-                        product_info['price'], 
-                        product_info['thumbnail_url'], 
-                        thumbnail_counter, 
-                        base_url, 
-                        current_page_number
-                    )
-                    
-                    if product_data:
-                        print(f"상품 '{product_info['name']}' (순위 {thumbnail_counter}) 정보 추출 완료.")
-                        
-                        cumulative_data.append(product_data)
-                        
-                        df = pd.DataFrame(cumulative_data)
-                        df.to_csv(csv_path, mode='w', index=False, encoding='utf-8-sig')
-                        print(f"상품 '{product_info['name']}' (순위 {thumbnail_counter})까지의 모든 데이터를 CSV에 덮어쓰기 완료.")
-
-                except Exception as e:
-                    print(f"상품 '{product_info['name']}' (순위 {thumbnail_counter}) 처리 중 치명적인 오류: {e}")
-                
-                thumbnail_counter += 1
-            break
-            
-    finally:
-        if driver:
-            driver.quit()
-            print("WebDriver 종료.")
-        
-        total_end_time = time.time()
-        total_duration = total_end_time - total_start_time
-        print("\n======== 전체 크롤링 완료 ========")
-        print(f"총 소요 시간: {total_duration:.2f}초 ({total_duration/60:.2f}분)")
+CRAWL_MODE = "json"  # "json": 스마트스토어 JSON 으로 전체 페이지 크롤링, "browser": 브라우저로 목록 첫 화면 (smartstore.SmartstoreAdapter)
+# browser 모드 목록 URL 과 목록 행(li.Hz4XxKbt9h)마다 읽는 값: (행 안의 css 선택자, 'text' 또는 속성)
+BROWSER_LISTING_URL = "{base}/{store_name}/category/{category_id}?st={sort}&dt=BIG_IMAGE&page={page}&size=80&filters=oa"
+BROWSER_LISTING_FIELDS = {
+    'thumbnail_url': ('img.eGeLGHztiu', 'src'),
+    'name': ('strong.xSW7C99vO3', 'text'),
+    'price': ('div.RIs7NC5ZLT', 'text'),
+    'product_url': ('a[data-shp-area*="list.pd"]', 'href'),
+}
+STORE_NAME = "luxhour"
+CATEGORY_ID = "018f26729d6b4887be02b37c5167953a"
+SORT_TYPE = "POPULAR"
+DETAIL_WORKERS = 4  # JSON 모드에서 상품 상세를 동시에 가져올 워커 수 (요청률은 rate_limiter 가 조절)
+
+SITE_NAME = "luxhour"
+CATEGORY_NAME = "all"  # 카테고리 변경시 변경 (Parquet 파티션 이름)
+OUTPUT_FORMAT = "csv"  # "csv": CAT_OUTPUT_DIR/raw_data.csv, "parquet": dataset/site=/category=/crawl_date= 파티션
+RAW_DATA_FIELDS = ['순위', '페이지', '상품명', '썸네일 이미지 파일명', '가격', '상품 상세', '상세 이미지 파일명']
+
+DETAIL_IMAGE_LINK_CLASS = "se-module-image-link __se_image_link __se_link"  # 상세 이미지를 감싼 링크
+# browser 모드로 연 상세 페이지에서 파싱하는 부분: #INTRODUCE 하위 트리
+DETAIL_TARGETS = [('div', 'id', 'INTRODUCE')]
+
+def configure(category, category_id):
+    # 오케스트레이터(crawl_jobs.json)가 다른 카테고리를 돌릴 때 호출. 위의 기본 카테고리 설정을 덮어쓴다
+    global CATEGORY_DIR, CAT_OUTPUT_DIR, THUMBNAIL_DIR, DETAIL_IMAGES_DIR, CATEGORY_NAME, CATEGORY_ID
+    CATEGORY_DIR = os.path.join(BASE_DIR, "luxhour") if category == "all" else os.path.join(BASE_DIR, "luxhour", category)  # 전체 카테고리는 기존 위치 그대로
+    CAT_OUTPUT_DIR = os.path.join(CATEGORY_DIR, f"{category}_output")
+    THUMBNAIL_DIR = os.path.join(CATEGORY_DIR, "썸네일")
+    DETAIL_IMAGES_DIR = os.path.join(CATEGORY_DIR, "상세사진")
+    CATEGORY_NAME = category
+    CATEGORY_ID = category_id
+
+
+class LuxhourAdapter(SmartstoreAdapter):
+    # 럭스아워는 첫 번째 상세 이미지를 썸네일로 쓰고, 마지막 상세 이미지는 받지 않는다
+    site_name = SITE_NAME
+    fields = RAW_DATA_FIELDS
+    detail_workers = DETAIL_WORKERS
+    detail_targets = DETAIL_TARGETS
+    detail_image = ('a', DETAIL_IMAGE_LINK_CLASS)
+    thumbnail_from_detail = True
+    drop_last_detail_image = True
+    browser_listing_url = BROWSER_LISTING_URL
+    browser_listing_fields = BROWSER_LISTING_FIELDS
+
+    def __init__(self):
+        super().__init__(STORE_NAME, CATEGORY_ID, CATEGORY_NAME, CAT_OUTPUT_DIR, THUMBNAIL_DIR, DETAIL_IMAGES_DIR,
+                         OUTPUT_FORMAT, crawl_mode=CRAWL_MODE, sort=SORT_TYPE)
+
+
+def main(resume=False):
+    print(f"크롤링을 시작합니다. ({CRAWL_MODE} 모드)")
+    return CrawlEngine(LuxhourAdapter(), resume=resume).run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", action="store_true", help="crawl_state.json 에 기록된 곳부터 이어서 크롤링")
+    args = parser.parse_args()
+    main(resume=args.resume)
@@ -0,0 +1,146 @@
+import argparse
+import importlib
+import json
+import os
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import redirect_stdout, redirect_stderr
+
+# 여러 사이트/카테고리 크롤링을 한 번에 돌리는 오케스트레이터.
+# crawl_jobs.json 의 jobs 를 프로세스 풀에서 동시에 실행하되, 같은 사이트는 site_concurrency 만큼만 동시에 돌린다.
+# rate_limiter 는 프로세스마다 따로 요청률을 세므로, 같은 호스트를 쓰는 사이트(ddd 와 luxhour 는 모두 스마트스토어)는
+# site_hosts 로 묶어 host_concurrency(기본 1)만큼만 동시에 돌린다 (호스트 하나에 두 프로세스가 각자 한도만큼 보내지 않도록).
+# 작업마다 새 프로세스에서 크롤러 모듈을 import 해 configure(...) 로 카테고리를 바꾼 뒤 main() 을 부르고,
+# 출력은 logs/<사이트>_<카테고리>.log 로 보낸다. 끝나면 작업별 행 수/소요 시간과 전체 요약을 출력한다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MANIFEST = os.path.join(BASE_DIR, "crawl_jobs.json")
+LOG_DIR = os.path.join(BASE_DIR, "logs")
+MAX_PROCESSES = 4
+DEFAULT_SITE_CONCURRENCY = 1  # site_concurrency 에 없는 사이트의 동시 실행 수
+DEFAULT_HOST_CONCURRENCY = 1  # host_concurrency 에 없는 호스트에 동시에 요청하는 작업 수
+# 사이트 -> 요청하는 호스트 (매니페스트의 site_hosts 로 덮어쓴다)
+SITE_HOSTS = {
+    'wiselux': "wiselux.co.kr",
+    'daall': "thedaall-dn.com",
+    'ddd': "smartstore.naver.com",
+    'luxhour': "smartstore.naver.com",
+}
+
+
+def load_manifest(path):
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    for job in manifest['jobs']:
+        if 'site' not in job or 'category' not in job:
+            raise ValueError(f"작업에 site 와 category 가 필요합니다: {job}")
+    return manifest
+
+
+def job_name(job):
+    return f"{job['site']}/{job['category']}"
+
+
+def run_job(job, resume=False):
+    # 워커 프로세스에서 실행된다. 결과 dict 를 돌려주며 예외는 밖으로 내보내지 않는다
+    params = {key: value for key, value in job.items() if key != 'site'}
+    log_path = os.path.join(LOG_DIR, f"{job['site']}_{job['category']}.log")
+    start_time = time.time()
+    rows = None
+    error = None
+    with open(log_path, 'a', encoding='utf-8') as log_file, redirect_stdout(log_file), redirect_stderr(log_file):
+        print(f"\n===== {job_name(job)} 시작: {time.strftime('%Y-%m-%d %H:%M:%S')} =====")
+        try:
+            crawler = importlib.import_module(job['site'])
+            crawler.configure(**params)
+            rows = crawler.main(resume=resume)
+        except Exception as e:
+            traceback.print_exc()
+            error = f"{type(e).__name__}: {e}"
+    return {
+        'job': job_name(job),
+        'rows': rows,
+        'error': error,
+        'duration': time.time() - start_time,
+        'log': log_path,
+    }
+
+
+def run_jobs(manifest, resume=False, max_processes=None):
+    jobs = list(manifest['jobs'])
+    max_processes = max_processes or manifest.get('max_processes', MAX_PROCESSES)
+    site_limits = manifest.get('site_concurrency', {})
+    site_hosts = {**SITE_HOSTS, **manifest.get('site_hosts', {})}
+    host_limits = manifest.get('host_concurrency', {})
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    total_start_time = time.time()
+    results = []
+    running = {}  # future -> job
+    site_running = Counter()
+    host_running = Counter()
+    print(f"--- 크롤링 작업 {len(jobs)}개, 프로세스 {max_processes}개 ---")
+
+    # 작업마다 새 프로세스를 쓴다: 크롤러 모듈의 전역 상태(카테고리 설정, 다운로드 서비스 등)가 섞이지 않도록
+    with ProcessPoolExecutor(max_workers=max_processes, max_tasks_per_child=1) as executor:
+        while jobs or running:
+            for job in list(jobs):
+                if len(running) >= max_processes:
+                    break
+                if site_running[job['site']] >= site_limits.get(job['site'], DEFAULT_SITE_CONCURRENCY):
+                    continue
+                host = site_hosts.get(job['site'], job['site'])
+                if host_running[host] >= host_limits.get(host, DEFAULT_HOST_CONCURRENCY):
+                    continue
+                jobs.remove(job)
+                running[executor.submit(run_job, job, resume)] = job
+                site_running[job['site']] += 1
+                host_running[host] += 1
+                print(f"[시작] {job_name(job)} (실행 중 {len(running)}개, 대기 {len(jobs)}개)")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                site_running[job['site']] -= 1
+                host_running[site_hosts.get(job['site'], job['site'])] -= 1
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # 워커 프로세스가 죽은 경우 등
+                    result = {'job': job_name(job), 'rows': None, 'error': f"{type(e).__name__}: {e}", 'duration': 0.0, 'log': None}
+                results.append(result)
+                status = f"실패 ({result['error']})" if result['error'] else f"{result['rows']}개 상품"
+                print(f"[{len(results)}/{len(manifest['jobs'])}] {result['job']}: {status} - {result['duration']:.2f}초")
+
+    print_summary(results, time.time() - total_start_time)
+    return results
+
+
+def print_summary(results, wall_time):
+    print("\n======== 크롤링 작업 요약 ========")
+    for result in sorted(results, key=lambda r: r['job']):
+        rows = "-" if result['rows'] is None else result['rows']
+        status = "실패" if result['error'] else "완료"
+        print(f"  {result['job']:<30} {status:<4} {rows:>8} 행 {result['duration']:>10.2f}초")
+    job_time = sum(result['duration'] for result in results)
+    total_rows = sum(result['rows'] or 0 for result in results)
+    failed = sum(1 for result in results if result['error'])
+    print(f"총 {len(results)}개 작업 (실패 {failed}개), {total_rows}개 상품")
+    print(f"전체 소요 시간: {wall_time:.2f}초 ({wall_time/60:.2f}분), 작업 시간 합계 {job_time:.2f}초"
+          f" (병렬 배수 {job_time / wall_time if wall_time else 0:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("manifest", nargs="?", default=DEFAULT_MANIFEST, help="작업 목록 JSON (기본: crawl_jobs.json)")
+    parser.add_argument("--resume", action="store_true", help="각 작업을 crawl_state.json 에 기록된 곳부터 이어서 크롤링")
+    parser.add_argument("--max-processes", type=int, help="동시에 실행할 프로세스 수 (기본: 매니페스트의 max_processes)")
+    parser.add_argument("--site", action="append", help="이 사이트의 작업만 실행 (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.manifest)
+    if args.site:
+        manifest['jobs'] = [job for job in manifest['jobs'] if job['site'] in args.site]
+    run_jobs(manifest, resume=args.resume, max_processes=args.max_processes)
@@ -1,19 +1,187 @@
 import pandas as pd
+import argparse
+import glob
 import re
 import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from extraction import ExtractionRules
+from result_writer import parse_price
 
-output_directory = "./acc/acc_output"
+# raw_data 를 CHUNK_SIZE 행씩 읽어 프로세스 풀에서 필드를 뽑고, 끝난 청크부터 순서대로 acc_data 에 이어 쓴다.
+# 인자 없이 실행하면 아래 raw_data_source 하나를, --all 이면 모든 카테고리의 *_output/raw_data.csv 를 처리한다.
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+output_directory = "./acc/acc_output"
+# raw_data.csv 또는 Parquet 파티션 (예: ./dataset/site=daall/category=watch) 을 지정할 수 있다
+raw_data_source = os.path.join(output_directory, "raw_data.csv")
+OUTPUT_FORMAT = "csv"  # "csv": acc_data.csv, "parquet": acc_data.parquet
+CHUNK_SIZE = 5000  # 한 번에 읽어 워커에 넘기는 행 수
+WORKERS = os.cpu_count() or 1  # 1 이면 프로세스 풀 없이 현재 프로세스에서 처리
+
+# 후처리에 필요한 컬럼만 읽는다 (없는 컬럼은 건너뜀)
+PRICE_COLUMNS = ['상품가격', '가격']  # daall 은 '상품가격', 나머지 사이트는 '가격'
+RAW_COLUMNS = ['순위', '페이지', '상품명', '상품 상세'] + PRICE_COLUMNS
+
+# '상품 상세' 에서 뽑는 필드: (필드명, 정규식, 정규식을 돌리기 전에 확인할 키워드)
+# 다른 사이트는 같은 형식의 규칙 목록을 만들어 ExtractionRules 에 넘기면 된다
+DETAIL_RULES = [
+    ('상태', r'상태\s*/\s*([^\n]+)', ['상태']),
+    ('각인', r'([A-Z]{1,2})\s*각인', ['각인']),
+    ('색상', r'(?m)^([^\n]+)\s*(?:색상|컬러|스킨)', ['색상', '컬러', '스킨']),
+    ('소재', r'(?m)^([^\n]+)\s*소재', ['소재']),
+    ('사이즈', r'사이즈\s*/\s*([^\n]+)', ['사이즈']),
+    ('부속품', r'구성품\s*/\s*([^\n]+)', ['구성품']),
+    ('구입시기', r'(\d{4}년 \d{1,2})월', ['년']),
+    ('구입가', r'(?:매장가|시중가) \s*([^\n]+)\s*(?:입니다|입니다.)', ['매장가', '시중가']),
+]
+
+
+def is_parquet_source(source):
+    return os.path.isdir(source) or source.endswith('.parquet')
+
+
+def iter_raw_chunks(source, columns=None, chunksize=CHUNK_SIZE):
+    # Parquet 는 필요한 컬럼만 record batch 단위로 스트리밍하고(memory-map 하지 않음), CSV 는 필요한 컬럼만 chunksize 행씩 파싱한다
+    if is_parquet_source(source):
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(source, format="parquet", partitioning="hive")
+        if columns is not None:
+            columns = [column for column in columns if column in dataset.schema.names]
+        for batch in dataset.to_batches(columns=columns, batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+    usecols = None if columns is None else (lambda column: column in columns)
+    yield from pd.read_csv(source, usecols=usecols, chunksize=chunksize)
+
+
+def read_raw_data(source, columns=None):
+    return pd.concat(iter_raw_chunks(source, columns), ignore_index=True)
+
+
+_detail_rules = None
+
+
+def get_detail_rules():
+    # 워커 프로세스마다 규칙을 한 번만 컴파일한다
+    global _detail_rules
+    if _detail_rules is None:
+        _detail_rules = ExtractionRules(DETAIL_RULES)
+    return _detail_rules
+
+
+def process_chunk(df_raw):
+    # raw_data 청크 -> acc_data 청크. 워커 프로세스에서 실행된다
+    detail_rules = get_detail_rules()
+    df_fields = pd.DataFrame.from_records(
+        detail_rules.extract_all(df_raw["상품 상세"].tolist()), columns=detail_rules.fields, index=df_raw.index
+    )
+    price_column = next((column for column in PRICE_COLUMNS if column in df_raw.columns), None)
 
-def match_re(inputs, re_expression):
-    if not isinstance(inputs, str):
-        return None
-    matched = re.search(re_expression, inputs, re.DOTALL)
-    if matched:
-        group_result = matched.group(1)
-        if group_result is not None:
-            return group_result.strip()
-    return None
+    df_processed = pd.DataFrame({
+        'rank': df_raw['순위'],
+        'page': df_raw['페이지'],
+        '상품명': df_raw['상품명'].fillna('').str.replace(r'\[명품다올동래]\s*', '', regex=True),
+        '판매가': df_raw[price_column] if price_column else None,
+    })
+    return pd.concat([df_processed, df_fields], axis=1)
+
+
+def output_filename(output_format=OUTPUT_FORMAT):
+    return f"acc_data.{'parquet' if output_format == 'parquet' else 'csv'}"
+
+
+class ProcessedWriter:
+    # acc_data 를 청크마다 이어 쓴다. CSV 는 처음에만 BOM 과 헤더를, Parquet 는 row group 을 하나씩 추가한다
+    def __init__(self, output_dir, output_format=OUTPUT_FORMAT):
+        self.output_format = output_format
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, output_filename(output_format))
+        self.rows_written = 0
+        self._file = None
+        self._parquet_writer = None
+
+    def write(self, df_processed):
+        if self.output_format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            # 청크마다 타입이 달라지지 않도록 판매가는 정수, 나머지 추출 필드는 문자열로 고정
+            df_processed = df_processed.assign(판매가=df_processed['판매가'].map(parse_price))
+            if self._parquet_writer is None:
+                self._schema = pa.schema([
+                    (column, pa.int64() if column in ('rank', 'page', '판매가') else pa.string())
+                    for column in df_processed.columns
+                ])
+                self._parquet_writer = pq.ParquetWriter(self.path, self._schema)
+            self._parquet_writer.write_table(pa.Table.from_pandas(df_processed, schema=self._schema, preserve_index=False))
+        else:
+            if self._file is None:
+                self._file = open(self.path, 'w', encoding="utf-8-sig", newline='')
+            df_processed.to_csv(self._file, index=False, header=self.rows_written == 0)
+        self.rows_written += len(df_processed)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def process_source(source, output_dir, executor=None, max_in_flight=2, chunksize=CHUNK_SIZE, output_format=OUTPUT_FORMAT):
+    # 청크를 워커에 넘기되 동시에 들고 있는 청크 수를 max_in_flight 로 제한하고, 결과는 읽은 순서대로 쓴다
+    start_time = time.time()
+    writer = ProcessedWriter(output_dir, output_format)
+    in_flight = deque()
+    try:
+        for df_raw in iter_raw_chunks(source, RAW_COLUMNS, chunksize):
+            if executor is None:
+                writer.write(process_chunk(df_raw))
+                continue
+            in_flight.append(executor.submit(process_chunk, df_raw))
+            while len(in_flight) >= max_in_flight:
+                writer.write(in_flight.popleft().result())
+        while in_flight:
+            writer.write(in_flight.popleft().result())
+    finally:
+        for future in in_flight:
+            future.cancel()
+        writer.close()
+    print(f"  > {source}: {writer.rows_written}행 -> {writer.path} ({time.time() - start_time:.2f}초)")
+    return writer.rows_written
+
+
+def find_raw_sources(root=BASE_DIR):
+    # 크롤러가 만드는 카테고리 출력 디렉토리(<카테고리>/<카테고리>_output/raw_data.csv) 를 모두 찾는다
+    return sorted(glob.glob(os.path.join(root, "**", "*_output", "raw_data.csv"), recursive=True))
+
+
+def partition_parts(source):
+    # Parquet 경로에서 hive 파티션 부분만 (예: ./dataset/site=daall/category=watch -> ['site=daall', 'category=watch'])
+    path = os.path.dirname(source) if source.endswith('.parquet') else source
+    return [part for part in os.path.normpath(path).split(os.sep) if '=' in part]
+
+
+def output_dir_for(source):
+    # raw_data.csv 는 같은 디렉토리에, Parquet 는 output_directory 아래 소스의 파티션 경로(site=/category=/...)에 결과를 쓴다
+    # (여러 Parquet 파티션을 한 번에 처리해도 acc_data 가 서로 덮어쓰지 않도록)
+    if is_parquet_source(source):
+        return os.path.join(output_directory, *partition_parts(source))
+    return os.path.dirname(source) or "."
+
+
+def plan_outputs(sources, output_format=OUTPUT_FORMAT):
+    # 소스마다 (소스, 출력 디렉토리). 두 소스가 같은 acc_data 파일에 쓰게 되면 ValueError (뒤의 것이 앞의 결과를 덮어쓴다)
+    planned = []
+    owners = {}
+    for source in sources:
+        output_dir = output_dir_for(source)
+        path = os.path.abspath(os.path.join(output_dir, output_filename(output_format)))
+        if path in owners:
+            raise ValueError(f"{owners[path]} 와 {source} 의 결과가 같은 파일에 쓰입니다: {path}")
+        owners[path] = source
+        planned.append((source, output_dir))
+    return planned
 
 
 def extract_filtered_accessory(text):
@@ -38,57 +206,34 @@ def extract_filtered_accessory(text):
     return None
 
 if __name__ == "__main__":
-
-    df_raw = pd.read_csv(output_directory + '/raw_data.csv')
-    raw_data = df_raw["상품 상세"].values.tolist()
-    df_raw['상품명'] = df_raw['상품명'].fillna('') 
-
-    df_processed = pd.DataFrame({
-        'rank': df_raw['순위'],
-        'page': df_raw['페이지'],
-        '상품명': df_raw['상품명'].apply(lambda x: re.sub(r'\[명품다올동래]\s*', '', x)),
-        '판매가': df_raw['상품가격'],
-        '상태': None,
-        '각인': None,
-        '색상': None,
-        '소재': None,
-        '사이즈': None,
-        '부속품': None,
-        '구입시기': None,
-        '구입가': None
-    })
-
-    df_processed["상태"] = df_raw["상품 상세"].apply(
-        lambda x: match_re(x, r'상태\s*/\s*([^\n]+)')
-    )
-
-    df_processed["각인"] = df_raw["상품 상세"].apply(
-        lambda x: match_re(x, r'([A-Z]{1,2})\s*각인')
-    )
-    df_processed["색상"] = df_raw["상품 상세"].apply(
-        lambda x: match_re(x, r'([^\n]+)\s*(?:색상|컬러|스킨)')
-    )
-    df_processed["소재"] = df_raw["상품 상세"].apply(
-        lambda x: match_re(x, r'([^\n]+)\s*소재')
-    )
-
-    df_processed["사이즈"] = df_raw["상품 상세"].apply(
-        lambda x: match_re(x, r'사이즈\s*/\s*([^\n]+)')
-    )
-
-    df_processed["부속품"] = df_raw["상품 상세"].apply(
-        lambda x: match_re(x, r'구성품\s*/\s*([^\n]+)')
-    )
-
-    df_processed["구입시기"] = df_raw["상품 상세"].apply(
-        lambda x: match_re(x, r'(\d{4}년 \d{1,2})월')
-    )
-
-    df_processed["구입가"] = df_raw["상품 상세"].apply(
-        lambda x: match_re(x, r'(?:[^\n:]*?\s*)(?:매장가|시중가) \s*([^\n]+)\s*(?:입니다|입니다.)')
-    )
-    
-
-    df_processed.to_csv(os.path.join(output_directory, "acc_data.csv"), index=False, encoding="utf-8-sig")
-    print("분석 결과가" + str(output_directory) + "에 저장되었습니다.")
-
+    parser = argparse.ArgumentParser(description="raw_data 에서 상품 상세 필드를 뽑아 acc_data 로 저장")
+    parser.add_argument("sources", nargs="*", help="raw_data.csv, 카테고리 출력 디렉토리 또는 Parquet 파티션 (기본: raw_data_source)")
+    parser.add_argument("--all", action="store_true", help="모든 카테고리의 *_output/raw_data.csv 처리")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--format", choices=["csv", "parquet"], default=OUTPUT_FORMAT)
+    args = parser.parse_args()
+
+    sources = []
+    for source in args.sources:
+        raw_csv = os.path.join(source, "raw_data.csv")
+        sources.append(raw_csv if os.path.isdir(source) and os.path.exists(raw_csv) else source)
+    if args.all:
+        sources.extend(source for source in find_raw_sources() if source not in sources)
+    if not sources:
+        sources = [raw_data_source]
+    try:
+        planned = plan_outputs(sources, args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    total_start_time = time.time()
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    total_rows = 0
+    try:
+        for source, output_dir in planned:
+            total_rows += process_source(source, output_dir, executor, 2 * args.workers, args.chunk_size, args.format)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    print(f"분석 결과가 저장되었습니다: {len(sources)}개 파일, {total_rows}행 ({time.time() - total_start_time:.2f}초)")
@@ -0,0 +1,180 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# 크롤러 전체가 공유하는 호스트별 요청 조절기.
+# 페이지 HTML(fetch_html)과 이미지(save_image) 요청이 모두 request(url) 로 슬롯을 받은 뒤 나간다.
+# 호스트마다 토큰 버킷(초당 요청 수)과 AIMD 동시성 한도를 둔다:
+#   응답이 빠르고 정상이면 동시성/요청률을 조금씩(가산) 올리고,
+#   429/503, 연결 오류, 평소보다 크게 느려진 응답이면 절반으로(승산) 줄인다. Retry-After 가 오면 그때까지 쉰다.
+
+DEFAULT_RATE = None  # 호스트당 초당 최대 요청 수 (None: 요청률 제한 없이 동시성만 조절)
+MIN_RATE = 0.5  # 줄일 때 내려가는 최저 요청률
+INITIAL_CONCURRENCY = 2
+MAX_HOST_CONCURRENCY = 16
+BACKOFF_STATUS_CODES = {429, 503}
+SLOW_FACTOR = 3.0  # 평균 응답 시간의 이 배수보다 느리면 과부하로 보고 줄인다
+LATENCY_ALPHA = 0.2  # 응답 시간 지수 이동 평균 가중치
+MAX_RETRY_AFTER = 120  # Retry-After 로 쉬는 최대 시간(초)
+
+
+def _retry_after_seconds(value):
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostLimiter:
+    def __init__(self, host, max_rate=DEFAULT_RATE, max_concurrency=MAX_HOST_CONCURRENCY):
+        self.host = host
+        self.max_rate = max_rate
+        self.rate = max_rate  # 현재 요청률 (AIMD 로 max_rate 이하에서 움직인다)
+        self.max_concurrency = max_concurrency
+        self.concurrency = min(INITIAL_CONCURRENCY, max_concurrency)  # 현재 동시성 한도 (실수, 정수 부분만큼 동시에 보낸다)
+        self.in_flight = 0
+        self.tokens = 1.0
+        self.last_refill = time.monotonic()
+        self.paused_until = 0.0
+        self.latency = None  # 응답 시간 지수 이동 평균 (초)
+        self.last_decrease = 0.0
+        self.requests = 0
+        self.backoffs = 0
+        self.waited = 0.0
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        if self.rate:
+            self.tokens = min(1.0, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self):
+        # 동시성 슬롯과 토큰이 모두 생길 때까지 대기
+        start = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                elif self.in_flight >= int(self.concurrency):
+                    delay = None  # release 에서 깨운다
+                elif self.rate and self.tokens < 1.0:
+                    delay = (1.0 - self.tokens) / self.rate
+                else:
+                    if self.rate:
+                        self.tokens -= 1.0
+                    self.in_flight += 1
+                    self.requests += 1
+                    self.waited += now - start
+                    return
+                self._condition.wait(delay)
+
+    def release(self, elapsed, status=None, error=False, retry_after=None):
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            slow = self.latency is not None and elapsed > SLOW_FACTOR * self.latency
+            if error or status in BACKOFF_STATUS_CODES or slow:
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + min(retry_after, MAX_RETRY_AFTER))
+                # 같은 혼잡으로 동시에 실패한 요청들 때문에 여러 번 줄지 않도록, 평균 응답 시간에 한 번만 줄인다
+                if now - self.last_decrease > (self.latency or 1.0):
+                    self.concurrency = max(1.0, self.concurrency / 2)
+                    if self.rate:
+                        self.rate = max(MIN_RATE, self.rate / 2)
+                    self.last_decrease = now
+                    self.backoffs += 1
+            else:
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1.0 / self.concurrency)
+                if self.rate and self.max_rate:
+                    self.rate = min(self.max_rate, self.rate + 1.0 / max(self.rate, 1.0))
+            if not error and status not in BACKOFF_STATUS_CODES:
+                self.latency = elapsed if self.latency is None else (1 - LATENCY_ALPHA) * self.latency + LATENCY_ALPHA * elapsed
+            self._condition.notify_all()
+
+
+class RequestSlot:
+    # with limiter.request(url) as slot: ... slot.record(response)
+    def __init__(self, host_limiter):
+        self.host_limiter = host_limiter
+        self.status = None
+        self.retry_after = None
+        self.latency = None
+
+    def record(self, response):
+        # 응답 시간은 본문 크기에 영향받지 않도록 헤더를 받기까지의 시간(response.elapsed)으로 잰다
+        self.status = response.status_code
+        self.retry_after = _retry_after_seconds(response.headers.get('Retry-After'))
+        self.latency = response.elapsed.total_seconds()
+
+    def __enter__(self):
+        self.host_limiter.acquire()
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 응답을 받지 못하고 예외로 끝나면 오류로 본다
+        error = exc_type is not None and self.status is None
+        elapsed = self.latency if self.latency is not None else time.monotonic() - self.start
+        self.host_limiter.release(elapsed, status=self.status, error=error, retry_after=self.retry_after)
+        return False
+
+
+class RateLimiter:
+    def __init__(self, default_rate=DEFAULT_RATE, max_concurrency=MAX_HOST_CONCURRENCY):
+        self.default_rate = default_rate
+        self.max_concurrency = max_concurrency
+        self._host_rates = {}
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def set_rate(self, host, rate):
+        # 호스트별 요청률 상한 (크롤러가 사이트 호스트에 거는 것. 나머지 호스트는 default_rate)
+        with self._lock:
+            self._host_rates[host] = rate
+            if host in self._hosts:
+                self._hosts[host].max_rate = self._hosts[host].rate = rate
+
+    def host(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            host_limiter = self._hosts.get(host)
+            if host_limiter is None:
+                host_limiter = self._hosts[host] = HostLimiter(
+                    host, self._host_rates.get(host, self.default_rate), self.max_concurrency
+                )
+        return host_limiter
+
+    def request(self, url):
+        return RequestSlot(self.host(url))
+
+    def summary(self):
+        with self._lock:
+            host_limiters = list(self._hosts.values())
+        lines = []
+        for h in sorted(host_limiters, key=lambda h: -h.requests):
+            rate = f"{h.rate:.1f}/s" if h.rate else "제한 없음"
+            latency = f"{h.latency * 1000:.0f}ms" if h.latency is not None else "-"
+            lines.append(f"  > {h.host}: 요청 {h.requests}개, 동시성 {int(h.concurrency)}, 요청률 {rate}, "
+                         f"평균 응답 {latency}, 감속 {h.backoffs}회, 대기 {h.waited:.1f}초")
+        return lines
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
@@ -0,0 +1,183 @@
+import csv
+import os
+import re
+import time
+import uuid
+
+# 크롤링 결과를 한 행씩 이어 쓰는 CSV writer.
+# 매 상품마다 DataFrame 을 만들어 raw_data.csv 전체를 다시 쓰던 방식을 대신한다.
+# 행은 필드 순서대로 튜플로만 잠시 들고 있다가 flush_every 마다 파일에 쓰고, fsync_every 마다 디스크까지 내린다.
+# 행을 파일에 내보낸 뒤에는 on_flush(synced) 를 부른다 (crawl_state 가 그 행들의 완료 ID 를 로그에 덧붙이고, synced 면 함께 fsync).
+# OUTPUT_FORMAT 을 "parquet" 로 두면 같은 인터페이스로 site/category/crawl_date 파티션의 Parquet 파일을 쓴다 (pyarrow 필요).
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_DIR = os.path.join(BASE_DIR, "dataset")
+
+# 컬럼명으로 Parquet 타입을 정한다
+INT_COLUMNS = {'순위', '페이지'}
+PRICE_COLUMNS = {'가격', '상품가격'}
+LIST_COLUMNS = {'상세 이미지 파일명'}
+
+
+class CsvResultWriter:
+    def __init__(self, csv_path, fieldnames, flush_every=1, fsync_every=20, append=False):
+        self.csv_path = csv_path
+        self.fieldnames = list(fieldnames)
+        self.flush_every = flush_every
+        self.fsync_every = fsync_every
+        self.rows_written = 0
+        self.on_flush = None
+        self._buffer = []
+        self._unsynced = 0
+
+        resume = append and os.path.exists(csv_path) and os.path.getsize(csv_path) > 0
+        # 새 파일만 BOM(utf-8-sig) 으로 시작한다. 이어 쓰는 파일에 BOM 이 다시 들어가지 않도록 utf-8 로 연다.
+        self._file = open(csv_path, 'a' if resume else 'w', encoding='utf-8' if resume else 'utf-8-sig', newline='')
+        self._writer = csv.writer(self._file)
+        if not resume:
+            self._writer.writerow(self.fieldnames)
+            self._file.flush()
+
+    @property
+    def count(self):
+        return self.rows_written + len(self._buffer)
+
+    def write(self, record):
+        # record: 필드명 -> 값 dict. 필드 순서의 튜플로만 보관한다
+        self._buffer.append(tuple(record.get(field) for field in self.fieldnames))
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self, sync=False):
+        # 파일에 내보낸 행이 있으면 True
+        flushed = bool(self._buffer)
+        if flushed:
+            self._writer.writerows(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._unsynced += len(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+        synced = False
+        if self._unsynced and (sync or self._unsynced >= self.fsync_every):
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+            synced = True
+        if flushed and self.on_flush is not None:
+            self.on_flush(synced)
+        return flushed
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush(sync=True)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def parse_price(value):
+    # "12,000원" / 12000 -> 12000, "가격 정보 없음" -> None
+    if value is None or isinstance(value, int):
+        return value
+    digits = re.sub(r'[^\d]', '', str(value))
+    return int(digits) if digits else None
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet 출력에는 pyarrow 가 필요합니다: pip install pyarrow")
+    return pa, pq
+
+
+class ParquetResultWriter:
+    # dataset/site=<site>/category=<category>/crawl_date=<YYYY-MM-DD>/part-*.parquet
+    # flush 할 때마다 part 파일 하나를 임시 이름으로 쓰고 rename 한다
+    def __init__(self, site, category, fieldnames, dataset_dir=DATASET_DIR, flush_every=500, crawl_date=None, append=False):
+        self._pa, self._pq = _import_pyarrow()
+        self.fieldnames = list(fieldnames)
+        self.flush_every = flush_every
+        self.rows_written = 0
+        self.on_flush = None
+        self._buffer = []
+        self._part_number = 0
+        self._run_id = uuid.uuid4().hex[:8]
+        self.partition_dir = os.path.join(
+            dataset_dir, f"site={site}", f"category={category}", f"crawl_date={crawl_date or time.strftime('%Y-%m-%d')}"
+        )
+        os.makedirs(self.partition_dir, exist_ok=True)
+        if not append:
+            # 같은 날짜 파티션을 새로 쓰는 경우 이전 part 파일 정리
+            for filename in os.listdir(self.partition_dir):
+                if filename.startswith("part-") and filename.endswith(".parquet"):
+                    os.remove(os.path.join(self.partition_dir, filename))
+        self.schema = self._pa.schema([(field, self._field_type(field)) for field in self.fieldnames])
+
+    def _field_type(self, field):
+        if field in INT_COLUMNS or field in PRICE_COLUMNS:
+            return self._pa.int64()
+        if field in LIST_COLUMNS:
+            return self._pa.list_(self._pa.string())
+        return self._pa.string()
+
+    def _convert(self, field, value):
+        if value is None:
+            return None
+        if field in INT_COLUMNS:
+            return int(value)
+        if field in PRICE_COLUMNS:
+            return parse_price(value)
+        if field in LIST_COLUMNS:
+            return [str(item) for item in value]
+        return str(value)
+
+    @property
+    def count(self):
+        return self.rows_written + len(self._buffer)
+
+    def write(self, record):
+        self._buffer.append(tuple(self._convert(field, record.get(field)) for field in self.fieldnames))
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self, sync=False):
+        # part 파일을 쓴 경우 True
+        if not self._buffer:
+            return False
+        columns = list(zip(*self._buffer))
+        table = self._pa.Table.from_arrays(
+            [self._pa.array(list(column), type=self.schema.field(i).type) for i, column in enumerate(columns)],
+            schema=self.schema,
+        )
+        part_path = os.path.join(self.partition_dir, f"part-{self._run_id}-{self._part_number:05d}.parquet")
+        tmp_path = part_path + ".tmp"
+        self._pq.write_table(table, tmp_path)
+        os.replace(tmp_path, part_path)
+        self._part_number += 1
+        self.rows_written += len(self._buffer)
+        self._buffer.clear()
+        if self.on_flush is not None:
+            self.on_flush(sync)
+        return True
+
+    def close(self):
+        self.flush(sync=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_result_writer(output_format, csv_path, site, category, fieldnames, flush_every=1, fsync_every=20, append=False):
+    # 크롤러가 OUTPUT_FORMAT 에 따라 writer 를 고르는 곳
+    if output_format == "parquet":
+        return ParquetResultWriter(site, category, fieldnames, append=append)
+    return CsvResultWriter(csv_path, fieldnames, flush_every=flush_every, fsync_every=fsync_every, append=append)
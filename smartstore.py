@@ -0,0 +1,373 @@
+import json
+import os
+import re
+import sys
+from urllib.parse import urlparse
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from browser import wait_for_dom_settled, wait_for_element, extract_rows
+from detail_parser import parse_html, scan_subtree
+from engine import SiteAdapter
+from http_client import fetch_html
+from tracing import get_tracer
+
+# 네이버 스마트스토어 페이지에 포함된 JSON(__PRELOADED_STATE__)을 읽어 목록/상세 데이터를 가져온다.
+# React 렌더링과 난독화된 클래스명(strong.xSW7C99vO3 등)에 의존하지 않는다.
+# ddd.py / luxhour.py 가 함께 쓰는 SmartstoreAdapter 도 여기에 둔다. 사이트 모듈은 스토어/카테고리, 목록 URL, 선택자만 정한다.
+
+SMARTSTORE_BASE = os.environ.get("SMARTSTORE_BASE", "https://smartstore.naver.com")
+PAGE_SIZE = 80
+
+BROWSER_PROFILE = "smartstore"  # browser.PROFILES 의 Chrome 프로필 (headless, eager 로드, 리소스 차단)
+BROWSER_DETAIL_WORKERS = 2  # browser 모드에서 상세 페이지를 동시에 여는 브라우저 수
+BROWSER_LISTING_ROW_SELECTOR = "li.Hz4XxKbt9h"  # browser 모드 목록의 상품 행
+EXPAND_BUTTON_XPATH = '//*[@id="INTRODUCE"]/div/div[3]/button'  # '상세정보 펼쳐보기' 버튼
+DETAIL_CONTENT_CLASS = "LXGzUhHJC2"  # 펼친 상세 영역 (browser 모드에서는 이 안의 문단만 상세 설명으로 모은다)
+DETAIL_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+
+_PRELOADED_STATE_RE = re.compile(r'window\.__PRELOADED_STATE__\s*=\s*')
+_UNDEFINED_RE = re.compile(r'(?<=[:\[,])\s*undefined(?=\s*[,\]}])')
+
+
+def category_page_url(store_name, category_id, page, size=PAGE_SIZE, sort="POPULAR"):
+    return f"{SMARTSTORE_BASE}/{store_name}/category/{category_id}?st={sort}&dt=BIG_IMAGE&page={page}&size={size}"
+
+
+def product_page_url(store_name, product_no):
+    return f"{SMARTSTORE_BASE}/{store_name}/products/{product_no}"
+
+
+def extract_preloaded_state(html):
+    matched = _PRELOADED_STATE_RE.search(html)
+    if not matched:
+        return None
+    script_end = html.find("</script>", matched.end())
+    payload = html[matched.end():script_end if script_end != -1 else len(html)]
+    # JS 리터럴 undefined 는 JSON이 아니므로 null 로 바꿔서 파싱
+    payload = _UNDEFINED_RE.sub("null", payload)
+    state, _ = json.JSONDecoder().raw_decode(payload)
+    return state
+
+
+def _walk(node):
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield current
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+
+
+def _is_listing_product(item):
+    return (isinstance(item, dict) and
+            ('id' in item or 'productNo' in item) and
+            'name' in item and
+            ('salePrice' in item or 'benefitsView' in item))
+
+
+def _node_products(node):
+    # node 의 값 중 상품 dict 로 이루어진 리스트 (없으면 None)
+    for value in node.values():
+        if isinstance(value, list) and value and all(_is_listing_product(item) for item in value):
+            return value
+    return None
+
+
+def _find_product_list(state):
+    # 상태 트리의 위치는 배포마다 바뀔 수 있으므로 경로 대신 카테고리 목록 노드(totalCount 와 page 를 가진 노드)를 찾는다.
+    # 같은 상태에 있는 위젯(베스트 상품 등)의 상품 리스트는 고르지 않는다.
+    # 목록 노드가 비어 있으면(마지막 페이지 다음) 빈 리스트, 목록 노드가 아예 없는 배포에서만 첫 번째 상품 리스트를 쓴다
+    listing_node = None
+    fallback = (None, [])
+    for node in _walk(state):
+        products = _node_products(node)
+        if 'totalCount' in node and 'page' in node:
+            if products:
+                return node, products
+            if listing_node is None:
+                listing_node = node
+        elif products and fallback[0] is None:
+            fallback = (node, products)
+    if listing_node is not None:
+        return listing_node, []
+    return fallback
+
+
+def _product_price(item):
+    benefits = item.get('benefitsView') or {}
+    price = benefits.get('discountedSalePrice') or item.get('salePrice')
+    if price is None:
+        return None
+    return int(str(price).replace('원', '').replace(',', '').strip())
+
+
+def parse_listing_state(state, store_name):
+    container, items = _find_product_list(state)
+    products = []
+    for item in items:
+        product_no = item.get('id') or item.get('productNo')
+        products.append({
+            'product_no': str(product_no),
+            'name': item['name'].strip(),
+            'price': _product_price(item),
+            'thumbnail_url': item.get('representativeImageUrl') or (item.get('representImage') or {}).get('url'),
+            'product_url': product_page_url(store_name, product_no),
+        })
+    total_count = container.get('totalCount') if container else None
+    return products, total_count
+
+
+def fetch_listing_page(store_name, category_id, page, size=PAGE_SIZE, sort="POPULAR"):
+    state = extract_preloaded_state(fetch_html(category_page_url(store_name, category_id, page, size, sort)))
+    if state is None:
+        raise ValueError(f"목록 페이지에서 __PRELOADED_STATE__ 를 찾을 수 없습니다: {store_name} {category_id} page={page}")
+    return parse_listing_state(state, store_name)
+
+
+def iter_listing_pages(store_name, category_id, size=PAGE_SIZE, sort="POPULAR", start_page=1):
+    # 마지막 페이지(totalCount 도달, totalCount 가 없으면 상품 수 < size 인 페이지)까지 순서대로 넘긴다
+    # totalCount 에 못 미쳤는데 빈 페이지가 오면 예외 (오케스트레이터가 작업을 실패로 기록한다)
+    page = start_page
+    seen = (start_page - 1) * size
+    known_total = None
+    while True:
+        # 요청 실패(fetch_html 이 재시도한 뒤)는 그대로 올린다: 여기서 끝내면 상품이 빠진 크롤링이 성공으로 끝난다
+        products, total_count = fetch_listing_page(store_name, category_id, page, size, sort)
+        # 목록 노드가 없는 응답(차단 페이지 등)이어도 앞 페이지에서 본 totalCount 로 판단한다
+        total_count = known_total = total_count if total_count is not None else known_total
+        if not products:
+            if total_count is not None and seen < total_count:
+                raise ValueError(f"목록 {page} 페이지가 비어 있습니다 ({seen}/{total_count}개 읽음): {store_name} {category_id}")
+            return
+        yield page, products
+        seen += len(products)
+        last_page = seen >= total_count if total_count is not None else len(products) < size
+        if last_page:
+            return
+        page += 1
+
+
+def parse_product_state(state, product_no):
+    product = None
+    for node in _walk(state):
+        if str(node.get('id') or node.get('productNo')) == str(product_no) and 'name' in node:
+            if product is None or 'detailContents' in node:
+                product = node
+    if product is None:
+        return None
+
+    content_html = None
+    for node in _walk(product):
+        for key in ('detailContentText', 'renderContent'):
+            if isinstance(node.get(key), str):
+                content_html = node[key]
+                break
+        if content_html is not None:
+            break
+
+    return {
+        'product_no': str(product_no),
+        'name': product['name'].strip(),
+        'price': _product_price(product),
+        'content_html': content_html,
+    }
+
+
+def fetch_product_detail(store_name, product_no):
+    state = extract_preloaded_state(fetch_html(product_page_url(store_name, product_no)))
+    if state is None:
+        raise ValueError(f"상품 페이지에서 __PRELOADED_STATE__ 를 찾을 수 없습니다: {product_no}")
+    return parse_product_state(state, product_no)
+
+
+def content_soup(detail):
+    # 상세 설명(스마트에디터 HTML)을 BeautifulSoup 으로 감싼다. 기존 #INTRODUCE 파싱 로직을 그대로 적용할 수 있다.
+    return parse_html(detail.get('content_html') or "")
+
+
+def clean_image_url(url, base_url=SMARTSTORE_BASE):
+    if not url:
+        return None
+    if url.startswith("data:image"):
+        return url
+    elif url.startswith("//"):
+        return "https:" + url
+    elif url.startswith("/"):
+        return base_url.rstrip('/') + url
+    else:
+        return url
+
+
+def click_expand_button(driver, timeout=10):
+    WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((By.XPATH, EXPAND_BUTTON_XPATH))).click()
+
+
+class SmartstoreAdapter(SiteAdapter):
+    # json 모드: 목록/상세 모두 __PRELOADED_STATE__ 에서 읽고 마지막 목록 페이지까지 넘긴다 (브라우저 없음)
+    # browser 모드: 목록 첫 화면을 브라우저로 읽고, 상세는 엔진의 브라우저 워커가 '상세정보 펼쳐보기' 를 누른 뒤 파싱
+    browser_profile = BROWSER_PROFILE
+    browser_listing_url = None  # browser 모드 목록 URL. {base}, {store_name}, {category_id}, {sort}, {page} 를 채운다
+    browser_listing_fields = {}  # browser 모드 목록 행마다 읽는 값: {키: (행 안의 css 선택자, 'text' 또는 속성)}
+    detail_image = ('img', None)  # 상세 이미지로 모을 태그 (태그 이름, 클래스). <a> 면 그 안의 <img>
+    thumbnail_from_detail = False  # True: 목록 썸네일 대신 첫 번째 상세 이미지를 썸네일로 쓴다
+    drop_last_detail_image = False  # True: 마지막 상세 이미지는 받지 않는다
+
+    def __init__(self, store_name, category_id, category_name, output_dir, thumbnail_dir, detail_images_dir,
+                 output_format="csv", crawl_mode="json", sort="POPULAR"):
+        super().__init__(category_name, output_dir, thumbnail_dir, detail_images_dir, output_format)
+        self.store_name = store_name
+        self.category_id = category_id
+        self.crawl_mode = crawl_mode
+        self.sort = sort
+        if crawl_mode == "browser":
+            self.fetch_mode = "browser"
+            self.detail_workers = BROWSER_DETAIL_WORKERS
+
+    def listing_pages(self, engine, start_page):
+        if self.crawl_mode == "browser":
+            yield from self._browser_listing(engine, start_page)
+            return
+        for page, product_info_list in iter_listing_pages(self.store_name, self.category_id, sort=self.sort, start_page=start_page):
+            for product_info in product_info_list:
+                product_info['id'] = product_info['product_no']
+            yield page, product_info_list
+
+    def _browser_listing(self, engine, page):
+        # 목록 첫 화면(한 페이지)의 썸네일/상품명/가격/URL 을 스크립트 한 번으로 읽는다
+        driver = engine.driver
+        page_url = self.browser_listing_url.format(base=SMARTSTORE_BASE, store_name=self.store_name,
+                                                   category_id=self.category_id, sort=self.sort, page=page)
+        print(f"사이트에 접속합니다: {page_url}")
+        with get_tracer().span("page_load", url=page_url, page=page) as span:
+            driver.get(page_url)
+            if not wait_for_element(driver, BROWSER_LISTING_ROW_SELECTOR, timeout=30):
+                span.fail("목록 없음")
+                print("더 이상 상품이 없거나 페이지 로딩 오류로 인해 크롤링을 종료합니다.")
+                return
+            rows = extract_rows(driver, BROWSER_LISTING_ROW_SELECTOR, self.browser_listing_fields)
+
+        product_info_list = []
+        for i, row in enumerate(rows):
+            # 첫 상세 이미지를 썸네일로 쓰는 사이트는 목록 썸네일이 없어도 된다
+            missing = [key for key, value in row.items()
+                       if value is None and not (key == 'thumbnail_url' and self.thumbnail_from_detail)]
+            try:
+                if missing:
+                    raise ValueError(f"{', '.join(missing)} 없음")
+                product_price = int(row['price'].replace('원', '').replace(',', '').strip())
+            except ValueError as e:
+                print(f"상품 목록 정보 추출 중 오류: {e}")
+                continue
+            product_info_list.append({'id': row['product_url'], 'index': i, **row, 'price': product_price})
+        print(f"현재 페이지에서 {len(product_info_list)}개의 상품 정보를 수집했습니다.")
+        if product_info_list:
+            yield page, product_info_list
+
+    def prepare_detail(self, driver):
+        # browser 모드: '상세정보 펼쳐보기' 를 누르고, 펼친 상세 영역이 다 채워질 때까지(DOM 변경이 멈출 때까지) 기다린다
+        with get_tracer().span("detail_expand"):
+            try:
+                click_expand_button(driver)
+                print("'상세정보 펼쳐보기' 버튼을 클릭 완료")
+            except Exception:
+                print("버튼을 찾지 못했습니다. 페이지 중간까지 스크롤을 시도합니다.")
+                try:
+                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
+                    click_expand_button(driver)
+                    print("스크롤 후 '상세정보 펼쳐보기' 버튼을 클릭 완료")
+                except Exception as e:
+                    print(f"스크롤 후에도 버튼을 찾을 수 없습니다: {e}")
+            wait_for_dom_settled(driver, f"div.{DETAIL_CONTENT_CLASS}")
+
+    def parse_description(self, root, text_within=None):
+        # root 를 한 번 돌며 상세 설명 문단(text_within 이 있으면 그 안의 것만)과 상세 이미지를 함께 수집
+        # {'description': 문단을 줄바꿈으로 이은 문자열 또는 None, 'images': 상세 이미지 URL 목록}
+        description_texts, image_tags = scan_subtree(root, ('p', None), self.detail_image, text_within)
+        detail_image_urls = []
+        for tag in image_tags:
+            img_tag = tag if tag.name == 'img' else tag.find('img')
+            if img_tag is None:
+                continue
+            image_url = clean_image_url(img_tag.get('data-src') or img_tag.get('src'))
+            if image_url and urlparse(image_url).path.lower().endswith(DETAIL_IMAGE_EXTENSIONS):
+                detail_image_urls.append(image_url)
+        if self.drop_last_detail_image:
+            detail_image_urls = detail_image_urls[:-1]
+        return {
+            'description': "\n".join(description_texts) if description_texts else None,
+            'images': detail_image_urls,
+        }
+
+    def extract_detail(self, soup):
+        # browser 모드로 연 상세 페이지: 펼친 상세 영역 안의 문단과 상세 이미지
+        return self.parse_description(soup, text_within=('div', DETAIL_CONTENT_CLASS))
+
+    def _json_detail(self, product_info):
+        # 브라우저 없이 상품 페이지의 __PRELOADED_STATE__ 에서 상세 설명을 읽는다
+        tracer = get_tracer()
+        with tracer.span("detail_fetch", product_no=product_info['product_no']):
+            detail = fetch_product_detail(self.store_name, product_info['product_no'])
+        if detail is None:
+            print(f"상품 JSON 에서 상세 정보를 찾을 수 없습니다: {product_info['product_url']}")
+            return None
+        with tracer.span("parse"):
+            return self.parse_description(content_soup(detail))
+
+    def crawl_detail(self, engine, product_info, rank, page):
+        product_data = {
+            '순위': rank,
+            '페이지': page,
+            '상품명': product_info['name'],
+            '썸네일 이미지 파일명': f"{rank}.jpg",
+            '가격': product_info['price'],
+            '상품 상세': None,
+            '상세 이미지 파일명': [],
+        }
+        if self.crawl_mode == "browser":
+            fields = engine.fetch_detail(product_info['product_url'])
+        else:
+            fields = self._json_detail(product_info)
+        if fields is None:
+            return None
+        product_data['상품 상세'] = fields['description']
+        detail_image_urls = fields['images']
+        print("상품 상세 정보 추출 완료")
+
+        # 이미지는 다운로드 서비스에 넘기고 기다리지 않는다
+        thumbnail_url = detail_image_urls[0] if self.thumbnail_from_detail and detail_image_urls else product_info.get('thumbnail_url')
+        if thumbnail_url:
+            engine.submit_image(thumbnail_url, product_data['썸네일 이미지 파일명'], self.thumbnail_dir, rank)
+        for i, image_url in enumerate(detail_image_urls, 1):
+            filename = f"{rank}_{i}.jpg"
+            engine.submit_image(image_url, filename, self.detail_images_dir, rank)
+            product_data['상세 이미지 파일명'].append(filename)
+        print(f"상세 이미지 URL 수집 및 다운로드 요청 완료 ({len(detail_image_urls)}개)")
+        print(f"상품 '{product_info['name']}' (순위 {rank}) 정보 추출 완료.")
+        return product_data
+
+
+def check_fixtures(fixture_dir):
+    # 녹화해 둔 페이로드로 파서를 점검한다: python smartstore.py fixtures/smartstore
+    for filename in sorted(os.listdir(fixture_dir)):
+        path = os.path.join(fixture_dir, filename)
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        state = extract_preloaded_state(text) if filename.endswith('.html') else json.loads(text)
+        if filename.startswith('listing'):
+            products, total_count = parse_listing_state(state, "fixture")
+            assert products, f"{filename}: 상품을 찾지 못했습니다"
+            assert all(p['name'] and p['price'] is not None for p in products), f"{filename}: 상품명/가격 누락"
+            print(f"{filename}: 상품 {len(products)}개 (totalCount={total_count})")
+        elif filename.startswith('product_'):
+            product_no = filename[len('product_'):].split('.')[0]
+            detail = parse_product_state(state, product_no)
+            assert detail and detail['content_html'], f"{filename}: 상세 설명을 찾지 못했습니다"
+            soup = content_soup(detail)
+            print(f"{filename}: {detail['name']} / {detail['price']}원 / 문단 {len(soup.find_all('p'))}개 / 이미지 {len(soup.find_all('img'))}개")
+
+
+if __name__ == "__main__":
+    check_fixtures(sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "smartstore"))
@@ -0,0 +1,40 @@
+import hashlib
+import os
+from image_store import ImageStore
+
+# image_processing 이 형식을 고친 파일은 다음 크롤링에서 원본 blob 으로 되돌아가면 안 된다
+
+
+def add_blob(store, body, image_url, ext):
+    staging_path = store.staging_path()
+    with open(staging_path, 'wb') as f:
+        f.write(body)
+    return store.add(staging_path, hashlib.sha256(body).hexdigest(), len(body), image_url=image_url, ext=ext)
+
+
+def test_link_uses_fixed_blob(tmp_path):
+    store = ImageStore(str(tmp_path / "store"))
+    blob_path = add_blob(store, b"png body", "http://example.com/a.png", ".png")
+    file_path = str(tmp_path / "1.jpg")
+    store.link(blob_path, file_path)
+
+    # 후처리가 .jpg 이름에 맞게 다시 저장 (새 파일로 교체)
+    fixed = b"jpeg body"
+    os.remove(file_path)
+    with open(file_path, 'wb') as f:
+        f.write(fixed)
+    store.record_fixed(hashlib.sha256(b"png body").hexdigest(), file_path, hashlib.sha256(fixed).hexdigest())
+
+    # 다음 크롤링: URL 인덱스는 여전히 원본 blob 을 가리키지만 고친 내용이 링크된다
+    store.link(store.lookup("http://example.com/a.png")['blob_path'], file_path)
+    with open(file_path, 'rb') as f:
+        assert f.read() == fixed
+    with open(blob_path, 'rb') as f:
+        assert f.read() == b"png body"
+
+    # 확장자가 다른 파일명은 원본 그대로
+    other_path = str(tmp_path / "1.png")
+    store.link(blob_path, other_path)
+    with open(other_path, 'rb') as f:
+        assert f.read() == b"png body"
+    store.close()
@@ -0,0 +1,34 @@
+import os
+import pytest
+import process_data
+
+# process_data 가 소스마다 고르는 acc_data 위치: 한 번에 여러 소스를 처리해도 서로 덮어쓰지 않아야 한다
+
+
+def make_partition(root, *parts):
+    path = os.path.join(root, "dataset", *parts)
+    os.makedirs(path)
+    return path
+
+
+def test_plan_outputs_separates_sources(tmp_path, monkeypatch):
+    # CSV 는 자기 디렉토리에, Parquet 파티션은 output_directory 아래 파티션 경로에 쓴다
+    monkeypatch.setattr(process_data, "output_directory", str(tmp_path / "acc"))
+    sources = [
+        make_partition(str(tmp_path), "site=daall", "category=watch"),
+        make_partition(str(tmp_path), "site=ddd", "category=bracelet"),
+        str(tmp_path / "watch" / "watch_output" / "raw_data.csv"),
+    ]
+    planned = process_data.plan_outputs(sources, "csv")
+    assert [output_dir for _, output_dir in planned] == [
+        str(tmp_path / "acc" / "site=daall" / "category=watch"),
+        str(tmp_path / "acc" / "site=ddd" / "category=bracelet"),
+        str(tmp_path / "watch" / "watch_output"),
+    ]
+
+
+def test_plan_outputs_rejects_shared_output(tmp_path, monkeypatch):
+    # 파티션 경로가 없는 Parquet 파일 둘은 같은 acc_data 로 가므로 처리 전에 거부한다
+    monkeypatch.setattr(process_data, "output_directory", str(tmp_path / "acc"))
+    with pytest.raises(ValueError):
+        process_data.plan_outputs([str(tmp_path / "a.parquet"), str(tmp_path / "b.parquet")], "parquet")
@@ -0,0 +1,99 @@
+import os
+import pytest
+import requests
+import ddd
+import luxhour
+import smartstore
+
+# fixtures/smartstore 에 저장해 둔 스마트스토어 페이지에 크롤러의 추출 코드를 그대로 돌려 본다
+# (smartstore.check_fixtures 는 <img> 개수만 세므로 크롤러가 고르는 이미지까지는 확인하지 못한다)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "smartstore")
+DESCRIPTION = "소재 / 925 실버\n사이즈 / 17cm + 3cm 연장\n구성품 / 전용 케이스, 보증서"
+DETAIL_IMAGES = [
+    "https://shop-phinf.pstatic.net/20240101_1/detail_1.jpg",
+    "https://shop-phinf.pstatic.net/20240101_1/detail_2.png",
+    "https://shop-phinf.pstatic.net/20240101_1/notice_banner.gif",
+]
+PRODUCT_NOS = ["8801234501", "8801234504"]
+
+
+LISTING_PAGES = {
+    1: ["8801234501", "8801234502", "8801234503"],
+    2: ["8801234504", "8801234505"],
+}
+
+
+def load_state(filename):
+    with open(os.path.join(FIXTURE_DIR, filename), encoding='utf-8') as f:
+        return smartstore.extract_preloaded_state(f.read())
+
+
+def product_content(product_no):
+    detail = smartstore.parse_product_state(load_state(f"product_{product_no}.html"), product_no)
+    assert detail is not None
+    return smartstore.content_soup(detail)
+
+
+@pytest.mark.parametrize("page", sorted(LISTING_PAGES))
+def test_listing_state(page):
+    # 1페이지에는 비어 있지 않은 베스트 상품 위젯이 함께 있다: 카테고리 목록만 골라야 한다
+    products, total_count = smartstore.parse_listing_state(load_state(f"listing_page{page}.html"), ddd.STORE_NAME)
+    assert [product['product_no'] for product in products] == LISTING_PAGES[page]
+    assert total_count == 5
+    assert all(product['name'] and product['price'] is not None and product['thumbnail_url'] for product in products)
+
+
+def listing_page_html(url):
+    # 목록 URL 의 page 로 저장해 둔 목록 페이지
+    page = int(url.split("page=")[1].split("&")[0])
+    with open(os.path.join(FIXTURE_DIR, f"listing_page{page}.html"), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_iter_listing_pages(monkeypatch):
+    # totalCount 까지 두 페이지를 넘긴다
+    monkeypatch.setattr(smartstore, "fetch_html", listing_page_html)
+    pages = list(smartstore.iter_listing_pages(ddd.STORE_NAME, ddd.CATEGORY_ID))
+    assert [(page, [product['product_no'] for product in products]) for page, products in pages] == sorted(LISTING_PAGES.items())
+
+
+def test_iter_listing_pages_failed_request(monkeypatch):
+    # 2페이지 요청이 실패하면 1페이지만 읽고 조용히 끝내지 않고 예외를 올린다
+    def fake_fetch_html(url):
+        if "page=2" in url:
+            raise requests.exceptions.ConnectionError("연결 끊김")
+        return listing_page_html(url)
+
+    monkeypatch.setattr(smartstore, "fetch_html", fake_fetch_html)
+    pages = smartstore.iter_listing_pages(ddd.STORE_NAME, ddd.CATEGORY_ID)
+    assert next(pages)[0] == 1
+    with pytest.raises(requests.exceptions.ConnectionError):
+        next(pages)
+
+
+def test_iter_listing_pages_empty_before_total(monkeypatch):
+    # totalCount(5) 중 3개만 읽었는데 빈 목록이 오면 끝까지 읽은 것으로 치지 않는다
+    def fake_fetch_html(url):
+        if "page=2" in url:
+            return '<script>window.__PRELOADED_STATE__={"category": {"A": {"page": 2, "totalCount": 5, "simpleProducts": []}}}</script>'
+        return listing_page_html(url)
+
+    monkeypatch.setattr(smartstore, "fetch_html", fake_fetch_html)
+    pages = smartstore.iter_listing_pages(ddd.STORE_NAME, ddd.CATEGORY_ID)
+    assert next(pages)[0] == 1
+    with pytest.raises(ValueError):
+        next(pages)
+
+
+@pytest.mark.parametrize("product_no", PRODUCT_NOS)
+def test_ddd_json_detail(product_no):
+    fields = ddd.DddAdapter().parse_description(product_content(product_no))
+    assert fields == {'description': DESCRIPTION, 'images': DETAIL_IMAGES}
+
+
+@pytest.mark.parametrize("product_no", PRODUCT_NOS)
+def test_luxhour_json_detail(product_no):
+    # 럭스아워는 마지막 이미지를 받지 않는다
+    fields = luxhour.LuxhourAdapter().parse_description(product_content(product_no))
+    assert fields == {'description': DESCRIPTION, 'images': DETAIL_IMAGES[:-1]}
@@ -0,0 +1,259 @@
+import itertools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+# 크롤링 단계별 추적과 지표 (print 타이밍 로그 대체).
+# with get_tracer().span("단계", product=순위, url=...) as span: ... 으로 구간을 감싸면 끝날 때
+#   - 단계별 소요 시간 히스토그램에 더하고
+#   - trace 파일(traces/<사이트>_<카테고리>_<시각>.jsonl)에 한 줄(JSON)로 기록한다.
+# 태그(site, category, product)는 start() 에서 준 값과 같은 스레드의 바깥 span 에서 물려받는다.
+# span 의 bytes / retries 값과 실패(예외 또는 span.fail())는 단계별 카운터로 모으고,
+# write_metrics() / close() 때 Prometheus textfile(metrics/<사이트>_<카테고리>.prom, node_exporter textfile collector 형식)로 쓴다.
+#
+# 단계: listing(목록 한 페이지를 얻기까지), page_load(브라우저 이동), http_fetch(HTML 요청),
+#       page(목록 한 페이지의 상세 처리), product(상품 하나), detail_fetch(상세 페이지 받기),
+#       detail_expand(스마트스토어 브라우저 모드의 '상세정보 펼쳐보기'), parse(상세 파싱),
+#       image_download(이미지 한 장), write(결과 행 쓰기)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TRACE_DIR = os.path.join(BASE_DIR, "traces")
+METRICS_DIR = os.path.join(BASE_DIR, "metrics")
+WRITE_TRACE = True  # False: trace 파일 없이 지표와 요약만 남긴다
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)  # 소요 시간 히스토그램 구간 상한(초)
+METRIC_PREFIX = "crawler"
+TAG_KEYS = ('site', 'category', 'product')
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        # 구간 상한으로 어림한 분위수 (+Inf 구간이면 최댓값)
+        target = q * self.count
+        running = 0
+        for i, count in enumerate(self.counts):
+            running += count
+            if running >= target and count:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+
+class Span:
+    def __init__(self, tracer, stage, tags, attrs):
+        self.tracer = tracer
+        self.stage = stage
+        self.tags = tags
+        self.attrs = attrs
+        self.error = None
+        self.failed = False
+
+    def set(self, **attrs):
+        # bytes / retries 처럼 끝날 때 카운터에 더할 값이나 trace 에 남길 값을 붙인다
+        self.attrs.update(attrs)
+
+    def fail(self, error=None):
+        # 예외 없이 실패로 끝난 구간 (save_image 가 None 을 돌려준 경우 등)
+        self.failed = True
+        if error is not None:
+            self.error = str(error)
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+        self.parent_id = stack[-1].span_id if stack else None
+        self.span_id = next(self.tracer._ids)
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        self.tracer._stack().remove(self)
+        if exc_type is not None:
+            self.fail(f"{exc_type.__name__}: {exc}")
+        self.tracer._finish(self)
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.tags = {}
+        self.trace_path = None
+        self.metrics_path = None
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._histograms = defaultdict(Histogram)  # 단계 -> 소요 시간
+        self._counters = defaultdict(float)  # (지표 이름, 단계) -> 값
+        self._trace_file = None
+
+    def start(self, site, category, trace_dir=None, metrics_dir=None):
+        # 크롤링 한 번(사이트/카테고리)의 시작. 이후 span 에 site/category 태그가 붙고 trace 파일을 연다
+        # 디렉토리를 주지 않으면 TRACE_DIR / METRICS_DIR (benchmark.py 는 작업 디렉토리로 바꿔 둔다)
+        trace_dir = trace_dir or TRACE_DIR
+        metrics_dir = metrics_dir or METRICS_DIR
+        self.close_trace()
+        with self._lock:
+            self.tags = {'site': site, 'category': category}
+            self._histograms.clear()
+            self._counters.clear()
+        name = f"{site}_{category}"
+        os.makedirs(metrics_dir, exist_ok=True)
+        self.metrics_path = os.path.join(metrics_dir, f"{name}.prom")
+        if WRITE_TRACE:
+            os.makedirs(trace_dir, exist_ok=True)
+            self.trace_path = os.path.join(trace_dir, f"{name}_{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+            self._trace_file = open(self.trace_path, 'a', encoding='utf-8')
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self):
+        # 이 스레드에서 열려 있는 가장 안쪽 span (없으면 None)
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def annotate(self, **attrs):
+        # 안쪽 함수(이미지 다운로드 등)가 span 을 넘겨받지 않고 값을 붙일 때
+        span = self.current()
+        if span is not None:
+            span.set(**attrs)
+
+    def span(self, stage, **attrs):
+        # product 는 태그로, 나머지는 trace 에만 남는 속성으로 다룬다
+        parent = self.current()
+        tags = dict(parent.tags) if parent else dict(self.tags)
+        for key in TAG_KEYS:
+            if key in attrs:
+                tags[key] = attrs.pop(key)
+        return Span(self, stage, tags, attrs)
+
+    def count(self, name, value=1, stage=None):
+        with self._lock:
+            self._counters[(name, stage)] += value
+
+    def _finish(self, span):
+        record = None
+        if self._trace_file is not None:
+            record = {'ts': round(span.started_at, 3), 'id': span.span_id, 'parent': span.parent_id, 'stage': span.stage,
+                      'ms': round(span.duration * 1000, 1), 'status': "error" if span.failed else "ok",
+                      **span.tags, **span.attrs}
+            if span.error:
+                record['error'] = span.error
+            record = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._histograms[span.stage].observe(span.duration)
+            for name in ('bytes', 'retries'):
+                if span.attrs.get(name):
+                    self._counters[(f"{name}_total", span.stage)] += span.attrs[name]
+            if span.failed:
+                self._counters[("failures_total", span.stage)] += 1
+            if record is not None and self._trace_file is not None:
+                self._trace_file.write(record + "\n")
+
+    def flush(self):
+        # 페이지마다 호출: trace 를 파일에 내보내고 지표 파일을 갱신한다
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.flush()
+        self.write_metrics()
+
+    def write_metrics(self):
+        if self.metrics_path is None:
+            return
+        labels = ",".join(f'{key}="{_escape(value)}"' for key, value in self.tags.items())
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items(), key=lambda item: (item[0][0], item[0][1] or ""))
+        metric = f"{METRIC_PREFIX}_stage_duration_seconds"
+        lines.append(f"# HELP {metric} 크롤링 단계별 소요 시간")
+        lines.append(f"# TYPE {metric} histogram")
+        for stage, histogram in histograms:
+            stage_labels = f'{labels},stage="{_escape(stage)}"'
+            running = 0
+            for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                running += count
+                lines.append(f'{metric}_bucket{{{stage_labels},le="{bound}"}} {running}')
+            lines.append(f"{metric}_sum{{{stage_labels}}} {histogram.sum:.6f}")
+            lines.append(f"{metric}_count{{{stage_labels}}} {histogram.count}")
+        declared = set()
+        for (name, stage), value in counters:
+            metric = f"{METRIC_PREFIX}_{name}"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            stage_labels = f'{labels},stage="{_escape(stage)}"' if stage else labels
+            lines.append(f"{metric}{{{stage_labels}}} {_format_value(value)}")
+        # textfile collector 가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓰고 rename
+        tmp_path = self.metrics_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.metrics_path)
+
+    def summary(self):
+        # 단계별 횟수/합계/평균/p50/p95/최대와 카운터 (분위수는 히스토그램 구간 상한으로 어림)
+        with self._lock:
+            histograms = sorted(self._histograms.items(), key=lambda item: -item[1].sum)
+            counters = sorted(self._counters.items(), key=lambda item: (item[0][0], item[0][1] or ""))
+        lines = [f"  {'단계':<15} {'횟수':>6} {'합계':>10} {'평균':>8} {'p50':>7} {'p95':>7} {'최대':>8}"]
+        for stage, h in histograms:
+            lines.append(f"  {stage:<15} {h.count:>6} {h.sum:>9.2f}s {h.sum / h.count:>7.3f}s "
+                         f"{'≤' + format(h.quantile(0.5), 'g'):>7} {'≤' + format(h.quantile(0.95), 'g'):>7} {h.max:>7.2f}s")
+        for (name, stage), value in counters:
+            lines.append(f"  {name}{f'[{stage}]' if stage else ''}: {value:g}")
+        return lines
+
+    def close_trace(self):
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.close()
+                self._trace_file = None
+
+    def close(self):
+        # 크롤링이 끝날 때: trace 파일을 닫고 지표 파일을 쓰고 단계별 요약을 출력
+        self.close_trace()
+        self.write_metrics()
+        print("단계별 소요 시간:")
+        for line in self.summary():
+            print(line)
+        if self.trace_path:
+            print(f"trace: {self.trace_path}")
+        if self.metrics_path:
+            print(f"지표: {self.metrics_path}")
+
+
+def _format_value(value):
+    # 정수는 그대로, 나머지는 repr(float) 로 쓴다 (:g 는 유효 숫자 6자리만 남겨 큰 카운터 값이 뭉개진다)
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_tracer = Tracer()
+
+
+def get_tracer():
+    return _tracer